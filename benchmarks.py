@@ -0,0 +1,219 @@
+import hashlib
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import time
+from collections.abc import Iterable
+from contextlib import closing
+from itertools import combinations
+from pathlib import Path
+from typing import NamedTuple
+
+
+db_path = Path(__file__).parent / 'bench_history.sqlite'
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    timestamp REAL NOT NULL,
+    day INTEGER NOT NULL,
+    part INTEGER NOT NULL,
+    version TEXT NOT NULL,
+    input_hash TEXT NOT NULL,
+    git_commit TEXT,
+    git_dirty INTEGER,
+    machine TEXT NOT NULL,
+    sample_count INTEGER NOT NULL,
+    mean_ms REAL NOT NULL,
+    median_ms REAL NOT NULL,
+    stdev_ms REAL NOT NULL,
+    min_ms REAL NOT NULL,
+    samples_ms TEXT NOT NULL,
+    baseline INTEGER NOT NULL DEFAULT 0
+)
+'''
+
+# Every recorded result is one run of one process. Iterations within a run share CPU frequency, caches and allocator
+# state, so they aren't independent samples: regressions are tested on the median of each run instead, with at least
+# MIN_RUNS runs of the current commit and of the baseline. A slowdown is reported when it's both statistically
+# significant and large enough to matter
+SIGNIFICANCE = 0.05
+MIN_SLOWDOWN = 1.10
+MIN_RUNS = 4      # the exact test can't get below p = 0.05 with 3 runs against 3
+MAX_RUNS = 8
+
+
+class BenchResult(NamedTuple):
+    id: int
+    timestamp: float
+    day: int
+    part: int
+    version: str
+    input_hash: str
+    git_commit: str | None
+    git_dirty: bool | None
+    machine: str
+    sample_count: int
+    mean_ms: float
+    median_ms: float
+    stdev_ms: float
+    min_ms: float
+    samples_ms: list[float]
+    baseline: bool
+
+    @classmethod
+    def from_row(cls, row: sqlite3.Row) -> 'BenchResult':
+        values = dict(row)
+        values['samples_ms'] = json.loads(values['samples_ms'])
+        values['git_dirty'] = None if values['git_dirty'] is None else bool(values['git_dirty'])
+        values['baseline'] = bool(values['baseline'])
+        return cls(**values)
+
+
+def connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute(SCHEMA)
+    return conn
+
+
+def input_hash(data: str) -> str:
+    return hashlib.sha256(data.encode('utf8')).hexdigest()[:16]
+
+
+def machine_info() -> str:
+    return f'{platform.node()}|{platform.machine()}|{platform.processor()}|{os.cpu_count()} cpus|' \
+           f'{platform.python_implementation()} {platform.python_version()}'
+
+
+def git_state() -> tuple[str | None, bool | None]:
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True,
+                                cwd=db_path.parent).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], capture_output=True,
+                               text=True, check=True, cwd=db_path.parent).stdout.strip() != ''
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def record_result(day: int, part: int, version: str | None, puzzle_input: str, samples_s: list[float]):
+    samples_ms = [s * 1000 for s in samples_s]
+    commit, dirty = git_state()
+    with closing(connect()) as conn, conn:
+        conn.execute(
+            'INSERT INTO results (timestamp, day, part, version, input_hash, git_commit, git_dirty, machine, '
+            'sample_count, mean_ms, median_ms, stdev_ms, min_ms, samples_ms) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?)',
+            (time.time(), day, part, version or '', input_hash(puzzle_input), commit,
+             None if dirty is None else int(dirty), machine_info(), len(samples_ms), statistics.fmean(samples_ms),
+             statistics.median(samples_ms), statistics.stdev(samples_ms) if len(samples_ms) > 1 else 0.0,
+             min(samples_ms), json.dumps(samples_ms))
+        )
+
+
+def history(day: int, part: int | None = None) -> list[BenchResult]:
+    query = 'SELECT * FROM results WHERE day = ?' + ('' if part is None else ' AND part = ?') + ' ORDER BY id'
+    with closing(connect()) as conn:
+        return list(BenchResult.from_row(r) for r in conn.execute(query, (day,) if part is None else (day, part)))
+
+
+def latest_results() -> list[BenchResult]:
+    """ Latest result of every day/part/version/input on this machine """
+    with closing(connect()) as conn:
+        rows = conn.execute('SELECT * FROM results WHERE id IN (SELECT MAX(id) FROM results WHERE machine = ? '
+                            'GROUP BY day, part, version, input_hash) ORDER BY day, part, version',
+                            (machine_info(),))
+        return list(BenchResult.from_row(r) for r in rows)
+
+
+_SERIES = 'day = ? AND part = ? AND version = ? AND input_hash = ? AND machine = ?'
+
+
+def _series_args(result: BenchResult) -> tuple:
+    return result.day, result.part, result.version, result.input_hash, result.machine
+
+
+def commit_runs(result: BenchResult) -> list[BenchResult]:
+    """ The latest runs (up to MAX_RUNS) of the result's series at the same commit, up to and including it """
+    with closing(connect()) as conn:
+        rows = conn.execute(f'SELECT * FROM results WHERE {_SERIES} AND git_commit IS ? AND git_dirty IS ? AND id <= ? '
+                            f'ORDER BY id DESC LIMIT ?',
+                            _series_args(result) + (result.git_commit, None if result.git_dirty is None
+                                                    else int(result.git_dirty), result.id, MAX_RUNS))
+        return list(BenchResult.from_row(r) for r in rows)
+
+
+def baseline_runs(result: BenchResult) -> list[BenchResult]:
+    """ The runs marked as baseline, or else the runs of the last other commit recorded before the result """
+    runs = commit_runs(result)
+    first_id = min(r.id for r in runs)
+    with closing(connect()) as conn:
+        rows = conn.execute(f'SELECT * FROM results WHERE {_SERIES} AND baseline = 1 AND id < ? ORDER BY id DESC '
+                            f'LIMIT ?', _series_args(result) + (first_id, MAX_RUNS)).fetchall()
+        if rows:
+            return list(BenchResult.from_row(r) for r in rows)
+        row = conn.execute(f'SELECT * FROM results WHERE {_SERIES} AND id < ? ORDER BY id DESC LIMIT 1',
+                           _series_args(result) + (first_id,)).fetchone()
+    return [] if row is None else commit_runs(BenchResult.from_row(row))
+
+
+def mark_baseline() -> int:
+    """ Marks the latest commit's runs of every series as the baseline for future checks """
+    ids = list(r.id for result in latest_results() for r in commit_runs(result))
+    with closing(connect()) as conn, conn:
+        conn.execute('UPDATE results SET baseline = 0 WHERE machine = ?', (machine_info(),))
+        conn.executemany('UPDATE results SET baseline = 1 WHERE id = ?', ((i,) for i in ids))
+    return len(ids)
+
+
+def _rank_sum(values: list[float], group: Iterable[int]) -> float:
+    """ Sum of the (tie-averaged) ranks of values[i] for i in group """
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return sum(ranks[i] for i in group)
+
+
+def slowdown_p_value(baseline: list[float], current: list[float]) -> float:
+    """ Exact one-sided Mann-Whitney (rank sum) test for current being slower than baseline, for small samples """
+    values = baseline + current
+    n = len(values)
+    observed = _rank_sum(values, range(len(baseline), n))
+    splits = list(combinations(range(n), len(current)))
+    return sum(1 for split in splits if _rank_sum(values, split) >= observed - 1e-9) / len(splits)
+
+
+class Regression(NamedTuple):
+    current: BenchResult
+    baseline_ms: float      # median of the per-run medians
+    current_ms: float
+    ratio: float
+    p_value: float
+    baseline_runs: int
+    current_runs: int
+
+
+def check_regressions() -> list[Regression]:
+    """ Significant slowdowns of the latest commit's runs against the baseline runs, compared run by run """
+    regressions = []
+    for result in latest_results():
+        current = list(r.median_ms for r in commit_runs(result))
+        baseline = list(r.median_ms for r in baseline_runs(result))
+        if min(len(current), len(baseline)) < MIN_RUNS:
+            continue
+        base_ms, cur_ms = statistics.median(baseline), statistics.median(current)
+        ratio = cur_ms / base_ms if base_ms > 0 else 1.0
+        p = slowdown_p_value(baseline, current)
+        if ratio >= MIN_SLOWDOWN and p < SIGNIFICANCE:
+            regressions.append(Regression(result, base_ms, cur_ms, ratio, p, len(baseline), len(current)))
+    return regressions
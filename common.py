@@ -1,7 +1,14 @@
+import atexit
+import operator
+import os
+import sys
 from abc import ABC, abstractmethod
-from enum import Enum
+from collections import OrderedDict, Counter
+from enum import Enum, IntEnum
+from functools import reduce, partial, update_wrapper
 from io import StringIO
-from typing import Iterator, Union, Generic, TypeVar, Sequence, Tuple, Self
+from itertools import chain, islice
+from typing import Iterator, Iterable, Union, Generic, TypeVar, Sequence, Tuple, Self, Callable, TextIO, Literal
 
 
 class Day(ABC):
@@ -13,6 +20,51 @@ class Day(ABC):
     def solve_part2(self, input_str: str) -> str:
         raise NotImplemented
 
+    # Optional streaming interface, solutions that can consume their input line by line may override these.
+    # Lines are passed without newlines.
+    def solve_part1_stream(self, lines: Iterable[str]) -> str:
+        raise NotImplementedError
+
+    def solve_part2_stream(self, lines: Iterable[str]) -> str:
+        raise NotImplementedError
+
+    # Optional resumable interface, for inputs that only ever get lines appended. Consumes new lines on top of the
+    # state returned by the previous call (None on the first call), returns the answer and the new state.
+    # The state must be picklable and may be modified in place.
+    def resume_part1(self, state: object | None, lines: Iterable[str]) -> tuple[str, object]:
+        raise NotImplementedError
+
+    def resume_part2(self, state: object | None, lines: Iterable[str]) -> tuple[str, object]:
+        raise NotImplementedError
+
+    # Optional parsed-input cache. parse_to_buffers returns the parsed input as a dict of flat buffers (array.array,
+    # bytes) and JSON-compatible scalars, which the runner stores next to the input. solve_partN_parsed solves from
+    # such a dict, where buffers loaded from the cache are read-only memoryviews cast to the array's typecode.
+    def parse_to_buffers(self, input_str: str) -> 'ParsedInput':
+        raise NotImplementedError
+
+    def solve_part1_parsed(self, parsed: 'ParsedInput') -> str:
+        raise NotImplementedError
+
+    def solve_part2_parsed(self, parsed: 'ParsedInput') -> str:
+        raise NotImplementedError
+
+    def _get_optional_method(self, method_name: str) -> Callable | None:
+        if getattr(type(self), method_name) is getattr(Day, method_name):
+            return None
+        return getattr(self, method_name)
+
+    def get_parsed_method(self, part: int) -> Callable[['ParsedInput'], str] | None:
+        if self._get_optional_method('parse_to_buffers') is None:
+            return None
+        return self._get_optional_method(f'solve_part{part}_parsed')
+
+    def get_stream_method(self, part: int) -> Callable[[Iterable[str]], str] | None:
+        return self._get_optional_method(f'solve_part{part}_stream')
+
+    def get_resume_method(self, part: int) -> Callable[[object | None, Iterable[str]], tuple[str, object]] | None:
+        return self._get_optional_method(f'resume_part{part}')
+
 
 def line_iterator(multiline_string: str, strip_newline: bool = True) -> Iterator[str]:
     for line in StringIO(multiline_string):
@@ -21,6 +73,463 @@ def line_iterator(multiline_string: str, strip_newline: bool = True) -> Iterator
         yield line
 
 
+def chunked_line_reader(f: TextIO, chunk_size: int = 1 << 20, prefetch: int = 4) -> Iterator[str]:
+    """
+    Yields lines without newlines, chunks of f are read ahead on a background thread so I/O overlaps solving.
+    The reader thread stops as well when the consumer stops early (the generator is closed or collected)
+    """
+    from queue import Queue, Full
+    from threading import Thread, Event
+    chunks: Queue[str] = Queue(maxsize=prefetch)
+    errors: list[BaseException] = []
+    stop = Event()
+
+    def put(chunk: str) -> bool:
+        while not stop.is_set():
+            try:
+                chunks.put(chunk, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
+
+    def read_chunks():
+        try:
+            while (chunk := f.read(chunk_size)) and put(chunk):
+                pass
+        except BaseException as e:
+            errors.append(e)
+        finally:
+            put('')
+
+    reader = Thread(target=read_chunks, daemon=True)
+    reader.start()
+    try:
+        rest = ''
+        while chunk := chunks.get():
+            lines = (rest + chunk).split('\n')
+            rest = lines.pop()
+            for line in lines:
+                yield line.rstrip('\r')
+        if errors:
+            raise errors[0]
+        if rest:
+            yield rest.rstrip('\r')
+    finally:
+        stop.set()
+
+
+# Parsed input files
+# Layout: 8-byte little-endian header size, a JSON header (cache key, scalars, and typecode, offset and size of every
+# buffer), then the raw buffers at 8-byte aligned offsets, so loading is a memory map and a cast per buffer
+ParsedInput = dict[str, object]
+PARSED_ALIGN = 8
+
+
+def write_parsed_input(path: str | os.PathLike, key: str, parsed: ParsedInput):
+    import json
+    from array import array
+    buffers: dict[str, tuple[str, bytes]] = {}
+    scalars: dict[str, object] = {}
+    for name, value in parsed.items():
+        if isinstance(value, array):
+            if value.typecode == 'u':
+                raise ValueError(f'unicode arrays cannot be stored ({name})')
+            buffers[name] = (value.typecode, value.tobytes())
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            buffers[name] = (memoryview(value).format, bytes(value))
+        else:
+            scalars[name] = value
+    layout: dict[str, tuple[str, int, int]] = {}
+    offset = 0
+    for name, (typecode, data) in buffers.items():
+        layout[name] = (typecode, offset, len(data))
+        offset += -(-len(data) // PARSED_ALIGN) * PARSED_ALIGN
+    header = json.dumps({'key': key, 'scalars': scalars, 'buffers': layout}).encode('utf8')
+    header += b' ' * (-len(header) % PARSED_ALIGN)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(len(header).to_bytes(8, 'little'))
+        f.write(header)
+        for typecode, data in buffers.values():
+            f.write(data)
+            f.write(bytes(-len(data) % PARSED_ALIGN))
+    os.replace(tmp_path, path)
+
+
+def read_parsed_input(path: str | os.PathLike, key: str) -> ParsedInput | None:
+    """ Memory maps a parsed input file, returns None if it doesn't exist or was stored under a different key """
+    import json
+    import mmap
+    try:
+        with open(path, 'rb') as f:
+            header_size = int.from_bytes(f.read(8), 'little')
+            header = json.loads(f.read(header_size))
+            if header.get('key') != key:
+                return None
+            data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))[8 + header_size:]
+    except (OSError, ValueError):
+        return None
+    parsed: ParsedInput = dict(header['scalars'])
+    for name, (typecode, offset, size) in header['buffers'].items():
+        buf = data[offset:offset + size]
+        parsed[name] = buf if typecode == 'B' else buf.cast(typecode)
+    return parsed
+
+
+# Tracing
+# Solutions fetch their tracer once at import time and guard every call with it, e.g.
+#   tracer = get_tracer(9)
+#   ...
+#   if tracer: tracer.debug(...)
+# so a disabled tracer (None) costs a single global lookup in hot loops. configure_tracing rebinds the module-level
+# tracer of solutions imported before it was called, so it must be named "tracer". Tracing is enabled with the trace
+# run flag or the AOC_TRACE environment variable ("all" or a comma-separated list of days, optionally followed by
+# ":level", e.g. "9,10:info"), AOC_TRACE_FILE sets the output file.
+
+class TraceLevel(IntEnum):
+    Debug = 10
+    Info = 20
+    Warning = 30
+
+
+class Tracer:
+    __slots__ = ['name', 'level', 'out']
+
+    def __init__(self, name: str, level: TraceLevel, out: TextIO):
+        self.name = name
+        self.level = level
+        self.out = out
+
+    def log(self, level: TraceLevel, *args):
+        if level >= self.level:
+            print(f'[{self.name}:{level.name}]', *args, file=self.out)
+
+    def debug(self, *args):
+        self.log(TraceLevel.Debug, *args)
+
+    def info(self, *args):
+        self.log(TraceLevel.Info, *args)
+
+    def warning(self, *args):
+        self.log(TraceLevel.Warning, *args)
+
+
+_trace_days: set[int] | None = set()    # None means all days
+_trace_level = TraceLevel.Debug
+_trace_path = os.environ.get('AOC_TRACE_FILE', 'trace_output.txt')
+_trace_out: TextIO | None = None
+_tracer_modules: dict[str, int] = {}    # names of the modules that fetched a tracer, and their day
+
+
+def configure_tracing(days: Iterable[int] | None, level: TraceLevel = TraceLevel.Debug, path: str = None):
+    """ Enables tracing for days (None for all days), and updates the tracers of already imported solutions """
+    global _trace_days, _trace_level, _trace_path
+    _trace_days = None if days is None else set(days)
+    _trace_level = level
+    if path is not None:
+        _trace_path = path
+    for name, day in _tracer_modules.items():
+        module = sys.modules.get(name)
+        if module is None:
+            continue
+        if hasattr(module, 'tracer'):
+            module.tracer = _make_tracer(day)
+        elif tracing_enabled(day):
+            print(f'Warning: {name} keeps its tracer under another name than "tracer", tracing has no effect',
+                  file=sys.stderr)
+
+
+def tracing_enabled(day: int) -> bool:
+    return _trace_days is None or day in _trace_days
+
+
+def get_tracer(day: int) -> Tracer | None:
+    """ Tracer for the calling module, or None if tracing is disabled for the day """
+    _tracer_modules[sys._getframe(1).f_globals.get('__name__')] = day
+    return _make_tracer(day)
+
+
+def _make_tracer(day: int) -> Tracer | None:
+    global _trace_out
+    if not tracing_enabled(day):
+        return None
+    if _trace_out is None:
+        _trace_out = open(_trace_path, mode='at', encoding='utf8', buffering=1 << 16)
+        atexit.register(_trace_out.close)
+    return Tracer(f'day{day}', _trace_level, _trace_out)
+
+
+def flush_traces():
+    if _trace_out is not None:
+        _trace_out.flush()
+
+
+if 'AOC_TRACE' in os.environ:
+    _days, _, _level = os.environ['AOC_TRACE'].partition(':')
+    configure_tracing(None if _days.strip().lower() == 'all' else (int(d) for d in _days.split(',') if d.strip()),
+                      TraceLevel[_level.strip().capitalize()] if _level else TraceLevel.Debug)
+
+
+# Memoization
+
+_MISSING = object()
+
+
+class MemoStats:
+    __slots__ = ['hits', 'misses', 'evictions']
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __repr__(self) -> str:
+        total = self.hits + self.misses
+        hit_rate = 0 if total == 0 else self.hits / total
+        return f'hits={self.hits} misses={self.misses} evictions={self.evictions} hit_rate={hit_rate:.1%}'
+
+
+class Memoized:
+    """ Memoizing wrapper around a function, see memoize() """
+    registry: list['Memoized'] = []
+
+    def __init__(self, func: Callable, max_size: int | None, policy: Literal['lru', 'lfu'], reset_per_run: bool,
+                 int_domain: int | None):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f'Invalid eviction policy: {policy}')
+        update_wrapper(self, func)
+        self.func = func
+        self.max_size = max_size
+        self.policy = policy
+        self.reset_per_run = reset_per_run
+        self.int_domain = int_domain
+        self.stats = MemoStats()
+        self.clear()
+        Memoized.registry.append(self)
+
+    def clear(self):
+        self.cache: OrderedDict = OrderedDict()
+        # lfu bookkeeping: use count per key, and keys grouped by use count in least recently used order
+        self.key_uses: dict = {}
+        self.use_buckets: dict[int, OrderedDict] = {}
+        self.min_uses = 0
+        self.table = None if self.int_domain is None else [_MISSING] * self.int_domain
+
+    def __call__(self, *args, **kwargs):
+        if self.table is not None and len(args) == 1 and not kwargs and type(args[0]) is int \
+                and 0 <= args[0] < self.int_domain:
+            # small dense int domain: plain table lookup, nothing to evict
+            val = self.table[args[0]]
+            if val is _MISSING:
+                self.stats.misses += 1
+                val = self.table[args[0]] = self.func(args[0])
+            else:
+                self.stats.hits += 1
+            return val
+        key = args if not kwargs else (args, tuple(sorted(kwargs.items())))
+        val = self.cache.get(key, _MISSING)
+        if val is not _MISSING:
+            self.stats.hits += 1
+            if self.policy == 'lru':
+                self.cache.move_to_end(key)
+            else:
+                self._lfu_touch(key)
+            return val
+        self.stats.misses += 1
+        val = self.func(*args, **kwargs)
+        if self.max_size is not None and len(self.cache) >= self.max_size:
+            self._evict()
+        self.cache[key] = val
+        if self.policy == 'lfu':
+            self.key_uses[key] = 1
+            self.use_buckets.setdefault(1, OrderedDict())[key] = None
+            self.min_uses = 1
+        return val
+
+    def _lfu_touch(self, key):
+        uses = self.key_uses[key]
+        bucket = self.use_buckets[uses]
+        del bucket[key]
+        if not bucket:
+            del self.use_buckets[uses]
+            if self.min_uses == uses:
+                self.min_uses = uses + 1
+        self.key_uses[key] = uses + 1
+        self.use_buckets.setdefault(uses + 1, OrderedDict())[key] = None
+
+    def _evict(self):
+        self.stats.evictions += 1
+        if self.policy == 'lru':
+            self.cache.popitem(last=False)
+            return
+        bucket = self.use_buckets[self.min_uses]
+        key, _ = bucket.popitem(last=False)
+        if not bucket:
+            del self.use_buckets[self.min_uses]
+        del self.key_uses[key]
+        del self.cache[key]
+
+    def __reduce__(self):
+        # pickled by reference, like the function it wraps
+        return self.__qualname__
+
+
+def memoize(max_size: int | None = 1024, policy: Literal['lru', 'lfu'] = 'lru', reset_per_run: bool = False,
+            int_domain: int | None = None) -> Callable[[Callable], Memoized]:
+    """
+    Memoization decorator with a bounded cache (max_size entries, None for unbounded) using LRU or LFU eviction.
+    reset_per_run caches are cleared at the start of every run_puzzle call. With int_domain set, calls with a single
+    int argument in [0, int_domain) are stored in a preallocated table instead.
+    """
+    def decorator(func: Callable) -> Memoized:
+        return Memoized(func, max_size, policy, reset_per_run, int_domain)
+    return decorator
+
+
+def reset_memos(per_run_only: bool = True):
+    """ Resets all stats, and clears the caches that are scoped to a single run (or all caches) """
+    for m in Memoized.registry:
+        m.stats = MemoStats()
+        if m.reset_per_run or not per_run_only:
+            m.clear()
+
+
+def memo_stats() -> dict[str, MemoStats]:
+    return {f'{m.__module__}.{m.__qualname__}': m.stats for m in Memoized.registry}
+
+
+# Parallel processing
+
+RT = TypeVar('RT')
+MT = TypeVar('MT')
+
+
+def _new_process_pool(max_workers: int):
+    from concurrent.futures import ProcessPoolExecutor
+    import threading
+    context = None
+    if threading.active_count() > 1:
+        # forked children inherit locks other threads (e.g. chunked_line_reader's) may hold at that moment
+        import multiprocessing
+        context = multiprocessing.get_context(
+            'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn')
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=context)
+
+
+_shared_pool = None
+_shared_pool_workers = 0
+
+
+def _get_shared_pool(max_workers: int):
+    """
+    The pool used by parallel_map_reduce, created on first use and kept until exit, so that repeated calls (parts,
+    benchmark iterations) don't pay for the worker startup every time
+    """
+    global _shared_pool, _shared_pool_workers
+    # noinspection PyProtectedMember
+    if _shared_pool is not None and (_shared_pool_workers != max_workers or _shared_pool._broken):
+        _shared_pool.shutdown(cancel_futures=True)
+        _shared_pool = None
+    if _shared_pool is None:
+        if not _shared_pool_workers:
+            atexit.register(_shutdown_shared_pool)
+        _shared_pool = _new_process_pool(max_workers)
+        _shared_pool_workers = max_workers
+    return _shared_pool
+
+
+def _shutdown_shared_pool():
+    global _shared_pool
+    if _shared_pool is not None:
+        _shared_pool.shutdown(cancel_futures=True)
+        _shared_pool = None
+
+
+def _map_reduce_chunk(func: Callable[[RT], MT], reduce_func: Callable[[MT, MT], MT], initial: MT,
+                      chunk: Sequence[RT]) -> MT:
+    return reduce(reduce_func, map(func, chunk), initial)
+
+
+def parallel_map_reduce(func: Callable[[RT], MT], records: Sequence[RT],
+                        reduce_func: Callable[[MT, MT], MT] = operator.add, initial: MT = 0, min_parallel: int = 1024,
+                        chunk_size: int | None = None, max_workers: int | None = None,
+                        cost: Callable[[RT], int] | None = None) -> MT:
+    """
+    Maps func over independent records and folds the results with reduce_func. Records are split into chunks and
+    spread over a shared process pool, unless there are fewer than min_parallel of them (or only 1 worker), in which
+    case they are processed serially to avoid the pool overhead. With cost, min_parallel applies to the records'
+    summed estimated cost instead of their number. func and the records must be picklable, and initial must be an
+    identity element for reduce_func since every chunk starts from it.
+    """
+    workers = max_workers or os.cpu_count() or 1
+    if workers < 2 or (len(records) if cost is None else _total_cost(cost, records, min_parallel)) < min_parallel:
+        return _map_reduce_chunk(func, reduce_func, initial, records)
+    if chunk_size is None:
+        # several chunks per worker, so that a few slow records don't leave the other workers idle
+        chunk_size = max(1, -(-len(records) // (workers * 4)))
+    chunks = [records[i:i + chunk_size] for i in range(0, len(records), chunk_size)]
+    chunk_results = _get_shared_pool(workers).map(partial(_map_reduce_chunk, func, reduce_func, initial), chunks)
+    return reduce(reduce_func, chunk_results, initial)
+
+
+def _total_cost(cost: Callable[[RT], int], records: Iterable[RT], limit: int) -> int:
+    """ Sums the records' costs, stopping once limit is reached """
+    total = 0
+    for r in records:
+        total += cost(r)
+        if total >= limit:
+            break
+    return total
+
+
+def parallel_map_reduce_stream(func: Callable[[RT], MT], records: Iterable[RT],
+                               reduce_func: Callable[[MT, MT], MT] = operator.add, initial: MT = 0,
+                               min_parallel: int = 1024, chunk_size: int = 256, max_workers: int | None = None,
+                               cost: Callable[[RT], int] | None = None) -> MT:
+    """
+    parallel_map_reduce for records that arrive from an iterator, e.g. a streamed input. Chunks are handed to the pool
+    as they are read, with only a few chunks per worker in flight, so memory stays bounded. Streams with fewer than
+    min_parallel records (or less estimated cost, see parallel_map_reduce) are processed serially. Results are folded
+    in order
+    """
+    workers = max_workers or os.cpu_count() or 1
+    records = iter(records)
+    if workers < 2:
+        return _map_reduce_chunk(func, reduce_func, initial, records)
+    if cost is None:
+        head = list(islice(records, min_parallel))
+        head_cost = len(head)
+    else:
+        head, head_cost = [], 0
+        for r in records:
+            head.append(r)
+            head_cost += cost(r)
+            if head_cost >= min_parallel:
+                break
+    if head_cost < min_parallel:
+        return _map_reduce_chunk(func, reduce_func, initial, head)
+    records = chain(head, records)
+    del head
+    from collections import deque
+    chunk_func = partial(_map_reduce_chunk, func, reduce_func, initial)
+    result = initial
+    pending = deque()
+    executor = _get_shared_pool(workers)
+    try:
+        while chunk := list(islice(records, chunk_size)):
+            pending.append(executor.submit(chunk_func, chunk))
+            if len(pending) >= workers * 4:
+                result = reduce_func(result, pending.popleft().result())
+        while pending:
+            result = reduce_func(result, pending.popleft().result())
+    finally:
+        # the pool outlives this call, chunks of a failed run must not keep it busy
+        for future in pending:
+            future.cancel()
+    return result
+
+
 # 2D grids
 
 class Direction(Enum):
@@ -111,13 +620,47 @@ class Vector:
         return hash((self.x, self.y))
 
 
+class PackedCoords:
+    """
+    Grid coordinates packed into single ints (y * stride + x), a cheaper alternative to Vector in hot loops since ints
+    hash natively. stride is width + 1, so that single steps off the left or right edge land in a spare column
+    (out of bounds) instead of wrapping around onto the neighbouring row.
+    """
+    __slots__ = ['width', 'stride', 'deltas']
+
+    def __init__(self, width: int):
+        self.width = width
+        self.stride = width + 1
+        self.deltas: dict[Direction, int] = {d: d.value[1] * self.stride + d.value[0] for d in DIRECTIONS_ALL}
+
+    def pack(self, x: int, y: int) -> int:
+        return y * self.stride + x
+
+    def unpack(self, pos: int) -> tuple[int, int]:
+        y, x = divmod(pos, self.stride)
+        return x, y
+
+    def from_vector(self, v: Vector) -> int:
+        return v.y * self.stride + v.x
+
+    def to_vector(self, pos: int) -> Vector:
+        y, x = divmod(pos, self.stride)
+        return Vector(x, y)
+
+    def move(self, pos: int, direction: Direction, dist: int = 1) -> int:
+        return pos + self.deltas[direction] * dist
+
+
 GT = TypeVar('GT')
 
 
 class Grid(Generic[GT]):
+    """ Grid cell positions can be given either as Vectors or as ints packed by the grid's packing """
+
     def __init__(self):
         self.lines: list[Sequence[GT]] = []
         self._width: int = 0
+        self._packing: PackedCoords | None = None
 
     @property
     def height(self):
@@ -135,15 +678,35 @@ class Grid(Generic[GT]):
         # noinspection PyTypeChecker
         self.lines.append(line)
 
-    def is_in_bounds(self, pos: Vector) -> bool:
+    @property
+    def packing(self) -> PackedCoords:
+        if self._packing is None or self._packing.width != self.width:
+            self._packing = PackedCoords(self.width)
+        return self._packing
+
+    def is_in_bounds(self, pos: Vector | int) -> bool:
+        if type(pos) is int:
+            y, x = divmod(pos, self._width + 1)
+            return x < self._width and 0 <= y < len(self.lines)
         return 0 <= pos.x < self._width and 0 <= pos.y < len(self.lines)
 
-    def get_cell(self, pos: Vector) -> GT:
+    def get_cell(self, pos: Vector | int) -> GT:
         if not self.is_in_bounds(pos):
             raise RuntimeError(f"pos {pos} is out of grid's bounds")
+        if type(pos) is int:
+            y, x = divmod(pos, self._width + 1)
+            return self.lines[y][x]
         return self.lines[pos.y][pos.x]
 
-    def look_around(self, pos: Vector, directions: Iterator[Direction] = DIRECTIONS_ALL) -> Iterator[Tuple[Vector, GT]]:
+    def look_around(self, pos: Vector | int, directions: Iterator[Direction] = DIRECTIONS_ALL)\
+            -> Iterator[Tuple[Vector | int, GT]]:
+        if type(pos) is int:
+            deltas = self.packing.deltas
+            for d in directions:
+                p = pos + deltas[d]
+                if self.is_in_bounds(p):
+                    yield p, self.get_cell(p)
+            return
         for d in directions:
             v = pos + d
             if self.is_in_bounds(v):
@@ -165,6 +728,47 @@ class Grid(Generic[GT]):
                 v = Vector(x, y)
                 yield v, self.get_cell(v)
 
+    def row_values(self, y: int) -> Sequence[GT]:
+        return self.lines[y]
+
+    def column_values(self, x: int) -> list[GT]:
+        return [line[x] for line in self.lines]
+
+    # Views, they share cells with this grid (but not its later resizes)
+
+    def _view(self, transform: tuple[int, int, int, int, int, int], width: int, height: int) -> 'GridView[GT]':
+        return GridView(self, transform, width, height)
+
+    def transposed(self) -> 'GridView[GT]':
+        return self._view((0, 0, 1, 0, 1, 0), self.height, self.width)
+
+    def rotated(self, turns: int = 1) -> 'GridView[GT]':
+        """ View rotated clockwise by turns * 90 degrees """
+        w, h = self.width, self.height
+        turns %= 4
+        if turns == 1:
+            return self._view((0, 0, 1, h - 1, -1, 0), h, w)
+        if turns == 2:
+            return self._view((w - 1, -1, 0, h - 1, 0, -1), w, h)
+        if turns == 3:
+            return self._view((w - 1, 0, -1, 0, 1, 0), h, w)
+        return self._view((0, 1, 0, 0, 0, 1), w, h)
+
+    def flipped(self, horizontal: bool = True) -> 'GridView[GT]':
+        if horizontal:
+            return self._view((self.width - 1, -1, 0, 0, 0, 1), self.width, self.height)
+        return self._view((0, 1, 0, self.height - 1, 0, -1), self.width, self.height)
+
+    def window(self, x: int, y: int, width: int, height: int) -> 'GridView[GT]':
+        if x < 0 or y < 0 or width < 0 or height < 0 or x + width > self.width or y + height > self.height:
+            raise RuntimeError(f'window ({x}, {y}, {width}x{height}) is out of bounds')
+        return self._view((x, 1, 0, y, 0, 1), width, height)
+
+    def strided(self, x_step: int, y_step: int) -> 'GridView[GT]':
+        if x_step < 1 or y_step < 1:
+            raise RuntimeError(f'invalid strides ({x_step}, {y_step})')
+        return self._view((0, x_step, 0, 0, 0, y_step), -(-self.width // x_step), -(-self.height // y_step))
+
 
 class LGrid(Grid[GT]):
     def __init__(self):
@@ -177,10 +781,14 @@ class LGrid(Grid[GT]):
             raise RuntimeError('line must be a list or define a __setitem__() method')
         return super().add_line(line)
 
-    def set_cell(self, pos: Vector, val: GT):
+    def set_cell(self, pos: Vector | int, val: GT):
         # Only works if lines are lists or other sequences that allow settings values
         if not self.is_in_bounds(pos):
             raise RuntimeError(f"pos {pos} is out of grid's bounds")
+        if type(pos) is int:
+            y, x = divmod(pos, self._width + 1)
+            self.lines[y][x] = val
+            return
         # noinspection PyUnresolvedReferences
         self.lines[pos.y][pos.x] = val
 
@@ -204,10 +812,15 @@ class LGrid(Grid[GT]):
         if overlay.width != self.width or overlay.height != self.height:
             raise RuntimeError(f'cannot merge with overlay of different dimensions '
                                f'({overlay.width}x{overlay.height}, expected {self.width}x{self.height})')
-        for p, v in overlay.scan_all():
-            if v == mask_vals:
-                continue
-            self.set_cell(p, v)
+        for y, line in enumerate(self.lines):   # type: int, list[GT]
+            overlay_row = overlay.row_values(y)
+            if not isinstance(overlay_row, list):
+                overlay_row = list(overlay_row)
+            masked = overlay_row.count(mask_vals)
+            if masked == 0:
+                line[:] = overlay_row
+            elif masked < len(overlay_row):
+                line[:] = [v if o == mask_vals else o for v, o in zip(line, overlay_row)]
 
     @classmethod
     def create(cls, width: int, height: int, fill_item: GT) -> Self:
@@ -217,6 +830,82 @@ class LGrid(Grid[GT]):
         return grid
 
 
+class GridView(Grid[GT]):
+    """
+    Read-only view of a grid with remapped coordinates, cells are not copied. A view cell (x, y) maps to the base grid
+    cell (x0 + xx * x + xy * y, y0 + yx * x + yy * y), where transform = (x0, xx, xy, y0, yx, yy).
+    """
+
+    # noinspection PyMissingConstructor
+    def __init__(self, base: Grid[GT], transform: tuple[int, int, int, int, int, int], width: int, height: int):
+        # no lines of its own, all cell access goes through the base grid
+        self.base = base
+        self.transform = transform
+        self._width = width
+        self._height = height
+        self._packing = None
+
+    @property
+    def height(self):
+        return self._height
+
+    def add_line(self, line: Sequence[GT]):
+        raise RuntimeError('cannot add lines to a grid view')
+
+    def to_base(self, x: int, y: int) -> tuple[int, int]:
+        x0, xx, xy, y0, yx, yy = self.transform
+        return x0 + xx * x + xy * y, y0 + yx * x + yy * y
+
+    def is_in_bounds(self, pos: Vector | int) -> bool:
+        if type(pos) is int:
+            y, x = divmod(pos, self._width + 1)
+            return x < self._width and 0 <= y < self._height
+        return 0 <= pos.x < self._width and 0 <= pos.y < self._height
+
+    def get_cell(self, pos: Vector | int) -> GT:
+        if not self.is_in_bounds(pos):
+            raise RuntimeError(f"pos {pos} is out of grid's bounds")
+        if type(pos) is int:
+            y, x = divmod(pos, self._width + 1)
+            x, y = self.to_base(x, y)
+        else:
+            x, y = self.to_base(pos.x, pos.y)
+        return self.base.lines[y][x]
+
+    @staticmethod
+    def _slice(start: int, step: int, count: int) -> slice:
+        stop = start + step * count
+        return slice(start, None if stop < 0 else stop, step)
+
+    def row_values(self, y: int) -> list[GT]:
+        x0, xx, xy, y0, yx, yy = self.transform
+        if yx == 0:
+            # the row lies within one base row
+            return list(self.base.lines[y0 + yy * y][self._slice(x0 + xy * y, xx, self._width)])
+        if xx == 0:
+            # the row lies within one base column
+            return [line[x0 + xy * y] for line in self.base.lines[self._slice(y0 + yy * y, yx, self._width)]]
+        return [self.base.lines[y0 + yx * x + yy * y][x0 + xx * x + xy * y] for x in range(self._width)]
+
+    def column_values(self, x: int) -> list[GT]:
+        return self.transposed().row_values(x)
+
+    def _view(self, transform: tuple[int, int, int, int, int, int], width: int, height: int) -> 'GridView[GT]':
+        # compose with this view's transform, so views of views still point straight at the base grid
+        a0, axx, axy, b0, byx, byy = transform
+        x0, xx, xy, y0, yx, yy = self.transform
+        composed = (x0 + xx * a0 + xy * b0, xx * axx + xy * byx, xx * axy + xy * byy,
+                    y0 + yx * a0 + yy * b0, yx * axx + yy * byx, yx * axy + yy * byy)
+        return GridView(self.base, composed, width, height)
+
+    def materialize(self) -> LGrid[GT]:
+        """ Copies the view's cells into a new, independent grid """
+        grid: LGrid[GT] = LGrid()
+        for y in range(self._height):
+            grid.add_line(self.row_values(y))
+        return grid
+
+
 class GridSearch:
     def __init__(self, search_char: str, replace_char: str, max_count: int | None = None):
         self.search_char = search_char
@@ -240,3 +929,309 @@ class GridSearch:
         if len(self.results) == 1:
             return self.results[0]
         raise RuntimeError(f'found an invalid number of "{self.search_char}" ({len(self.results)})')
+
+
+class GridPeeler(Generic[GT]):
+    """ k-core style peeling: repeatedly removes cells that have fewer than k matching neighbours """
+
+    def __init__(self, grid: Grid[GT], cell_val: GT, directions: Iterable[Direction] = DIRECTIONS_ALL):
+        # Cells are stored on a flat, integer-indexed array with a 1-cell empty border, so neighbour lookups
+        # never need bounds checks
+        self.stride = grid.width + 2
+        size = (grid.height + 2) * self.stride
+        self.offsets: tuple[int, ...] = tuple(d.value[1] * self.stride + d.value[0] for d in directions)
+        self.present = bytearray(size)
+        for y, line in enumerate(grid.lines):
+            row_start = (y + 1) * self.stride + 1
+            self.present[row_start:row_start + grid.width] = bytes(int(v == cell_val) for v in line)
+
+        # Count every cell's neighbours once, a whole shifted slice at a time
+        lo, hi = self.stride + 1, size - self.stride - 1
+        counts = [0] * max(hi - lo, 0)
+        for o in self.offsets:
+            counts = list(map(operator.add, counts, self.present[lo + o:hi + o]))
+        self.counts = bytearray(lo) + bytearray(counts) + bytearray(size - lo - len(counts))
+
+    def to_vector(self, index: int) -> Vector:
+        y, x = divmod(index, self.stride)
+        return Vector(x - 1, y - 1)
+
+    def _index_range(self, rows: range | None) -> tuple[int, int]:
+        if rows is None:
+            return 0, len(self.present)
+        return (rows.start + 1) * self.stride, (rows.stop + 1) * self.stride
+
+    def below(self, k: int, rows: range | None = None) -> list[int]:
+        """ Indices of present cells that have fewer than k neighbours, optionally only within the given rows """
+        counts = self.counts
+        lo, hi = self._index_range(rows)
+        return [i for i, p in enumerate(self.present[lo:hi], lo) if p and counts[i] < k]
+
+    def peel(self, k: int, rows: range | None = None) -> list[int]:
+        """
+        Removes cells with fewer than k neighbours until none are left, returns removed indices in order.
+        If rows is given, only cells within those rows are removed, the others are treated as fixed
+        """
+        present, counts, offsets = self.present, self.counts, self.offsets
+        lo, hi = self._index_range(rows)
+        queue = self.below(k, rows)
+        for i in queue:
+            present[i] = 0
+        qi = 0
+        while qi < len(queue):
+            i = queue[qi]
+            qi += 1
+            for o in offsets:
+                j = i + o
+                if present[j]:
+                    counts[j] -= 1
+                    if counts[j] < k and lo <= j < hi:
+                        present[j] = 0
+                        queue.append(j)
+        return queue
+
+
+# Tiled grid processing
+# Shared memory segments attached by this process, so that a worker attaches every grid only once
+_attached_segments: dict[str, object] = {}
+
+
+def _attach_segment(name: str) -> memoryview:
+    if name not in _attached_segments:
+        from multiprocessing.shared_memory import SharedMemory
+        _attached_segments[name] = SharedMemory(name=name)
+    # noinspection PyUnresolvedReferences
+    return _attached_segments[name].buf
+
+
+def _encode_row(line: Sequence) -> bytes:
+    if isinstance(line, (bytes, bytearray, memoryview)):
+        return bytes(line)
+    if isinstance(line, str):
+        return line.encode('latin-1')
+    if len(line) > 0 and isinstance(line[0], str):
+        return ''.join(line).encode('latin-1')
+    return bytes(line)
+
+
+class GridTile:
+    """
+    A band of rows [y_from, y_to) of a TiledGrid, plus up to halo rows above and below it. Local row 0 is the first
+    halo row. Tiles pickle as the shared memory name and their bounds, the grid data is never copied to workers
+    """
+    __slots__ = ['shm_name', 'width', 'height', 'halo', 'top', 'y_from', 'y_to', 'bottom', '_buf']
+
+    def __init__(self, shm_name: str | None, width: int, height: int, halo: int, y_from: int, y_to: int,
+                 buf: bytearray | memoryview | None = None):
+        self.shm_name = shm_name
+        self.width = width
+        self.height = height
+        self.halo = halo
+        self.top = max(0, y_from - halo)
+        self.y_from = y_from
+        self.y_to = y_to
+        self.bottom = min(y_to + halo, height)
+        self._buf = buf
+
+    def __reduce__(self):
+        return GridTile, (self.shm_name, self.width, self.height, self.halo, self.y_from, self.y_to)
+
+    @property
+    def buffer(self) -> bytearray | memoryview:
+        if self._buf is None:
+            self._buf = _attach_segment(self.shm_name)
+        return self._buf
+
+    @property
+    def own_rows(self) -> range:
+        """ Local indices of the rows this tile owns, the others are halo rows """
+        return range(self.y_from - self.top, self.y_to - self.top)
+
+    @property
+    def has_neighbours(self) -> bool:
+        return self.y_from > 0 or self.y_to < self.height
+
+    def rows(self) -> list[bytes]:
+        buf, w = self.buffer, self.width
+        return [bytes(buf[y * w:(y + 1) * w]) for y in range(self.top, self.bottom)]
+
+    def as_grid(self) -> Grid[int]:
+        grid: Grid[int] = Grid()
+        for row in self.rows():
+            grid.add_line(row)
+        return grid
+
+    def plane(self, index: int) -> memoryview:
+        """ A whole state plane of the TiledGrid, indexed by y * width + x. Plane 0 is the grid itself """
+        size = self.width * self.height
+        return memoryview(self.buffer)[index * size:(index + 1) * size]
+
+    def set_cell(self, x: int, y: int, value: int):
+        """ Writes a cell at local row y, which must be one of the tile's own rows """
+        if not self.y_from <= y + self.top < self.y_to:
+            raise ValueError(f'row {y} is not owned by the tile')
+        self.buffer[(y + self.top) * self.width + x] = value
+
+    def edge_cells(self, cells: Iterable[int]) -> list[int]:
+        """ The cells (y * width + x) out of the given own cells that lie in other tiles' halos """
+        lo = (self.y_from + self.halo) * self.width if self.y_from > 0 else 0
+        hi = (self.y_to - self.halo) * self.width if self.y_to < self.height else self.height * self.width
+        return [c for c in cells if not lo <= c < hi]
+
+
+class TiledGrid:
+    """
+    A byte grid (str cells are stored by their code) that kernels process band by band, in a process pool when the
+    grid is large enough. The grid then lives in shared memory, so workers read it and write their own rows in place
+    without any pickling. Kernels must only write their own rows, halo rows may be changed by other tiles meanwhile.
+    Extra zeroed state planes of the grid's size can be allocated for kernels that keep per-cell state across calls.
+    """
+
+    def __init__(self, grid: Grid, halo: int = 1, band_rows: int | None = None, max_workers: int | None = None,
+                 min_parallel_rows: int = 1024, planes: int = 0):
+        self.width, self.height = grid.width, grid.height
+        workers = max_workers or os.cpu_count() or 1
+        self.parallel = workers >= 2 and self.height >= min_parallel_rows
+        self._executor = None
+        self._shm = None
+        size = self.width * self.height
+        if self.parallel:
+            from multiprocessing.shared_memory import SharedMemory
+            self._shm = SharedMemory(create=True, size=max(size * (planes + 1), 1))
+            buf, name = self._shm.buf, self._shm.name
+        else:
+            buf, name = bytearray(size * (planes + 1)), None
+        for y, line in enumerate(grid.lines):
+            buf[y * self.width:(y + 1) * self.width] = _encode_row(line)
+        self._buf = buf
+
+        if not self.parallel:
+            band_rows = max(self.height, 1)
+        elif band_rows is None:
+            # several bands per worker, so that uneven bands don't leave workers idle
+            band_rows = max(1, -(-self.height // (workers * 4)))
+        self.workers = workers
+        self.halo = halo
+        self.band_rows = band_rows
+        self.tiles = [GridTile(name, self.width, self.height, halo, y, min(y + band_rows, self.height),
+                               None if self.parallel else buf)
+                      for y in range(0, self.height, band_rows)]
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._shm is not None:
+            self._buf = bytes(self._buf)
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    def row(self, y: int) -> bytes:
+        return bytes(self._buf[y * self.width:(y + 1) * self.width])
+
+    def _map(self, func: Callable, *iterables: Iterable) -> Iterator:
+        if not self.parallel:
+            return map(func, *iterables)
+        if self._executor is None:
+            self._executor = _new_process_pool(min(self.workers, len(self.tiles)))
+        return self._executor.map(func, *iterables)
+
+    def map_reduce(self, kernel: Callable[[GridTile], MT], reduce_func: Callable[[MT, MT], MT] = operator.add,
+                   initial: MT = 0) -> MT:
+        """ Runs kernel on every tile and folds the results in row order. kernel must be picklable """
+        return reduce(reduce_func, self._map(kernel, self.tiles), initial)
+
+    def until_stable(self, kernel: Callable[[GridTile, list[int] | None], tuple[int, list[int]]]) -> int:
+        """
+        For iterative kernels that keep their state in the state planes. kernel(tile, None) runs once on every tile,
+        then kernel(tile, seeds) only on tiles whose halo changed, with the changed halo cells as seeds, until no halo
+        changes. kernel returns the number of cells it changed and which of them lie in other tiles' halos
+        (tile.edge_cells), as y * width + x. Returns the total number of changes
+        """
+        total = 0
+        tiles, seeds = self.tiles, [None] * len(self.tiles)
+        while tiles:
+            edge_cells: list[int] = []
+            for changed, edges in self._map(kernel, tiles, seeds):
+                total += changed
+                edge_cells.extend(edges)
+            seeds_by_tile: dict[int, list[int]] = {}
+            for c in edge_cells:
+                y = c // self.width
+                owner = y // self.band_rows
+                for i in range(max(0, (y - self.halo) // self.band_rows),
+                               min(len(self.tiles), (y + self.halo) // self.band_rows + 1)):
+                    if i != owner:
+                        seeds_by_tile.setdefault(i, []).append(c)
+            tiles = [self.tiles[i] for i in seeds_by_tile]
+            seeds = list(seeds_by_tile.values())
+        return total
+
+
+# Operation counters
+# Counting wrappers are only swapped in while counters are enabled, so the primitives run untouched otherwise
+
+op_counts: Counter[str] = Counter()
+_op_originals: dict[tuple[object, str], Callable] = {}
+
+
+def _counting_line_iterator(multiline_string: str, strip_newline: bool = True) -> Iterator[str]:
+    for line in _op_originals[(sys.modules[__name__], 'line_iterator')](multiline_string, strip_newline):
+        op_counts['line_iterator lines'] += 1
+        yield line
+
+
+def _counting_method(name: str, method: Callable) -> Callable:
+    def wrapper(*args, **kwargs):
+        op_counts[name] += 1
+        return method(*args, **kwargs)
+    return wrapper
+
+
+def _counting_look_around(self: Grid, pos: Vector, directions: Iterator[Direction] = DIRECTIONS_ALL)\
+        -> Iterator[Tuple[Vector, GT]]:
+    for item in _op_originals[(Grid, 'look_around')](self, pos, directions):
+        op_counts['Grid.look_around yields'] += 1
+        yield item
+
+
+def enable_op_counters():
+    if _op_originals:
+        return
+    module = sys.modules[__name__]
+    replacements = {
+        (Grid, 'get_cell'): _counting_method('Grid.get_cell', Grid.get_cell),
+        (Grid, 'is_in_bounds'): _counting_method('Grid.is_in_bounds', Grid.is_in_bounds),
+        (Grid, 'look_around'): _counting_look_around,
+        (Vector, '__init__'): _counting_method('Vector constructions', Vector.__init__),
+        (module, 'line_iterator'): _counting_line_iterator,
+    }
+    for (owner, name), replacement in replacements.items():
+        _op_originals[(owner, name)] = getattr(owner, name)
+        setattr(owner, name, replacement)
+    # solution modules hold their own reference to line_iterator
+    _rebind_module_refs(_op_originals[(module, 'line_iterator')], _counting_line_iterator)
+
+
+def disable_op_counters():
+    if not _op_originals:
+        return
+    original_line_iterator = _op_originals[(sys.modules[__name__], 'line_iterator')]
+    for (owner, name), original in _op_originals.items():
+        setattr(owner, name, original)
+    _op_originals.clear()
+    _rebind_module_refs(_counting_line_iterator, original_line_iterator)
+
+
+def _rebind_module_refs(old: Callable, new: Callable):
+    for mod in list(sys.modules.values()):
+        mod_dict = getattr(mod, '__dict__', None)
+        if mod_dict is not None and mod_dict.get('line_iterator') is old:
+            mod_dict['line_iterator'] = new
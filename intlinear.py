@@ -0,0 +1,140 @@
+from collections.abc import Sequence
+from math import gcd, lcm
+
+
+def _normalize_row(row: list[int]) -> list[int]:
+    g = 0
+    for v in row:
+        g = gcd(g, v)
+    return row if g <= 1 else [v // g for v in row]
+
+
+def _row_echelon(matrix: Sequence[Sequence[int]], target: Sequence[int], var_count: int)\
+        -> tuple[list[list[int]], list[int]] | None:
+    """ Fraction-free Gauss-Jordan elimination, returns (pivot rows, pivot columns) or None if inconsistent """
+    rows = [list(matrix[j]) + [target[j]] for j in range(len(target))]
+    pivots: list[int] = []
+    for c in range(var_count):
+        rank = len(pivots)
+        r = next((r for r in range(rank, len(rows)) if rows[r][c] != 0), None)
+        if r is None:
+            continue
+        rows[rank], rows[r] = rows[r], rows[rank]
+        pr = rows[rank]
+        if pr[c] < 0:
+            pr = rows[rank] = [-v for v in pr]
+        for i, row in enumerate(rows):
+            if i != rank and row[c] != 0:
+                a, p = row[c], pr[c]
+                rows[i] = _normalize_row([v * p - pv * a for v, pv in zip(row, pr)])
+        pivots.append(c)
+    if any(row[-1] != 0 for row in rows[len(pivots):]):
+        return None
+    return rows[:len(pivots)], pivots
+
+
+def minimize_sum(matrix: Sequence[Sequence[int]], target: Sequence[int],
+                 upper_bounds: Sequence[int] | None = None) -> list[int] | None:
+    """
+    Finds non-negative integers x minimizing sum(x) such that matrix @ x == target exactly.
+    Returns None if no such x exists. Without explicit upper_bounds, the matrix must be non-negative, every variable
+    is then bounded by the smallest target it contributes to.
+    """
+    var_count = len(matrix[0]) if matrix else 0
+    if upper_bounds is None:
+        upper_bounds = [min((t for row, t in zip(matrix, target) if row[i] != 0), default=0)
+                        for i in range(var_count)]
+    ech = _row_echelon(matrix, target, var_count)
+    if ech is None:
+        return None
+    rows, pivots = ech
+
+    # Each pivot row now reads: d * x_pivot + sum(a_f * x_f for free f) = rhs
+    pivot_set = set(pivots)
+    # Branch on the tightly bounded free variables first, the last one is solved directly
+    free = sorted((c for c in range(var_count) if c not in pivot_set), key=lambda c: upper_bounds[c])
+    diag = [row[c] for row, c in zip(rows, pivots)]
+    pivot_ub = [upper_bounds[c] for c in pivots]
+    coefs = [[row[f] for row in rows] for f in free]     # coefs[k][r]: free variable k's coefficient in row r
+    free_ub = [upper_bounds[f] for f in free]
+
+    # Objective, scaled by the diagonal's lcm to stay in integers: scale * sum(x) = const + sum(cost_k * x_free_k)
+    scale = lcm(*diag)
+    const = sum(row[-1] * (scale // d) for row, d in zip(rows, diag))
+    costs = [scale - sum(a * (scale // d) for a, d in zip(col, diag)) for col in coefs]
+
+    # Ranges of the remaining free variables' contributions to each row, and to the objective
+    depth_count = len(free)
+    rest_lo = [[0] * len(rows) for _ in range(depth_count + 1)]
+    rest_hi = [[0] * len(rows) for _ in range(depth_count + 1)]
+    rest_cost = [0] * (depth_count + 1)
+    for k in range(depth_count - 1, -1, -1):
+        for r in range(len(rows)):
+            s = coefs[k][r] * free_ub[k]
+            rest_lo[k][r] = rest_lo[k + 1][r] + min(0, s)
+            rest_hi[k][r] = rest_hi[k + 1][r] + max(0, s)
+        rest_cost[k] = rest_cost[k + 1] + min(0, costs[k] * free_ub[k])
+
+    best: list[int | None] = [None]
+    best_free: list[int] = []
+    assigned = [0] * depth_count
+
+    def feasible(partial: list[int], k: int) -> bool:
+        # the remaining free variables must be able to put every pivot variable within [0, ub]
+        lo, hi = rest_lo[k], rest_hi[k]
+        return all(max(lo[r], partial[r] - diag[r] * pivot_ub[r]) <= min(hi[r], partial[r])
+                   for r in range(len(rows)))
+
+    def record(value: int):
+        if best[0] is None or value < best[0]:
+            best[0] = value
+            best_free[:] = assigned
+
+    def solve_last(partial: list[int], value: int):
+        k = depth_count - 1
+        col = coefs[k]
+        lo, hi = 0, free_ub[k]
+        for r, a in enumerate(col):
+            p, d = partial[r], diag[r]
+            if a == 0:
+                if not 0 <= p <= d * pivot_ub[r]:
+                    return
+            elif a > 0:
+                lo, hi = max(lo, -((d * pivot_ub[r] - p) // a)), min(hi, p // a)
+            else:
+                lo, hi = max(lo, -(p // -a)), min(hi, (d * pivot_ub[r] - p) // -a)
+        candidates = range(lo, hi + 1) if costs[k] >= 0 else range(hi, lo - 1, -1)
+        for x in candidates:
+            if all((partial[r] - a * x) % diag[r] == 0 for r, a in enumerate(col)):
+                assigned[k] = x
+                record(value + costs[k] * x)
+                return
+
+    def search(k: int, partial: list[int], value: int):
+        if best[0] is not None and value + rest_cost[k] >= best[0]:
+            return
+        if not feasible(partial, k):
+            return
+        if k == depth_count - 1:
+            solve_last(partial, value)
+            return
+        col = coefs[k]
+        for x in range(free_ub[k] + 1):
+            assigned[k] = x
+            search(k + 1, [p - a * x for p, a in zip(partial, col)], value + costs[k] * x)
+
+    rhs = [row[-1] for row in rows]
+    if depth_count == 0:
+        if all(p % d == 0 and 0 <= p // d <= ub for p, d, ub in zip(rhs, diag, pivot_ub)):
+            record(const)
+    else:
+        search(0, rhs, const)
+    if best[0] is None:
+        return None
+
+    solution = [0] * var_count
+    for f, x in zip(free, best_free):
+        solution[f] = x
+    for r, c in enumerate(pivots):
+        solution[c] = (rhs[r] - sum(coefs[k][r] * x for k, x in enumerate(best_free))) // diag[r]
+    return solution
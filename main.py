@@ -1,17 +1,25 @@
+import os
 import sys
 import time
 from importlib import import_module
 from pathlib import Path
-from timeit import timeit
 from types import ModuleType, NoneType
-from typing import Literal, Dict, Type, Protocol
+from typing import Literal, Dict, Type, Protocol, TYPE_CHECKING
 
-from common import Day
+# Everything else is imported where it's used, so that importing the runner stays cheap
+if TYPE_CHECKING:
+    from common import Day, TraceLevel, ParsedInput
 
 
 dir_names = {'inputs': 'inputs', 'solutions': 'solutions'}
 
 
+solution_class_pattern = r'^class (Day\d+\w*)\('
+registry_cache_path = Path(__file__).parent / '.solutions_cache.json'
+STARTUP_BUDGET_MS = 50
+STARTUP_SAMPLES = 5
+
+
 class SolutionMethod(Protocol):
     def __call__(self, input_str: str) -> str:
         pass
@@ -41,49 +49,159 @@ def generate_new_day(args: list[str]):
         in_path.touch(exist_ok=True)
 
 
+def discover_solutions(path_prefix: str = '') -> dict[int, list[str]]:
+    """
+    Maps day numbers to the solution classes defined in solutions/dayN.py. Sources are scanned, not imported, and the
+    results are cached by file modification time and size.
+    """
+    import json
+    import re
+    solution_class_regex = re.compile(solution_class_pattern, re.MULTILINE)
+    try:
+        cache: dict[str, list] = json.loads(registry_cache_path.read_text(encoding='utf8'))
+    except (OSError, ValueError):
+        cache = {}
+    new_cache: dict[str, list] = {}
+    solutions: dict[int, list[str]] = {}
+    for path in sorted(Path(path_prefix, dir_names['solutions']).glob('day*.py')):
+        day_match = re.fullmatch(r'day(\d+)\.py', path.name)
+        if day_match is None:
+            continue
+        stat = path.stat()
+        cached = cache.get(path.name)
+        if cached is not None and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            classes = cached[2]
+        else:
+            classes = solution_class_regex.findall(path.read_text(encoding='utf8'))
+        new_cache[path.name] = [stat.st_mtime_ns, stat.st_size, classes]
+        solutions[int(day_match[1])] = classes
+    if new_cache != cache:
+        try:
+            registry_cache_path.write_text(json.dumps(new_cache), encoding='utf8')
+        except OSError:
+            pass
+    return dict(sorted(solutions.items()))
+
+
+def load_solution(day: int, version: str = None, s_module: str | ModuleType = None,
+                  s_class: str | Type['Day'] = None, s_inst_kwargs: Dict = None) -> 'Day':
+    if isinstance(s_class, (str, NoneType)):
+        if not isinstance(s_module, ModuleType):
+            if s_class is None and s_module is None:
+                # check the registry first, so that a missing solution doesn't cost any imports
+                class_name = f'Day{day}' + (f'V{version}' if version else '')
+                available = discover_solutions().get(day)
+                if available is None:
+                    raise ValueError(f'no solution module for day {day}')
+                if class_name not in available:
+                    raise ValueError(f'no solution class {class_name} for day {day} (available: {", ".join(available)})')
+            if s_module is None:
+                s_module = f'day{day}'
+            s_module = import_module(f'{dir_names["solutions"]}.{s_module}')
+        if s_class is None:
+            s_class = f'Day{day}'
+            if version:
+                s_class += f'V{version}'
+        s_class = getattr(s_module, s_class)
+    day_class: Type[Day] = s_class
+    # noinspection PyArgumentList
+    return day_class(**({} if s_inst_kwargs is None else s_inst_kwargs))
+
+
 def run_puzzle(day: int, part: Literal[1, 2], version: str = None, s_module: str | ModuleType = None,
-               s_class: str | Type[Day] = None, s_inst_kwargs: Dict = None, s_instance: Day = None,
-               input_file: str = None, path_prefix: str = '', time_iters: int | None = None):
+               s_class: str | Type['Day'] = None, s_inst_kwargs: Dict = None, s_instance: 'Day' = None,
+               input_file: str = None, path_prefix: str = '', time_iters: int | None = None, stream: bool = True,
+               trace: 'TraceLevel | None' = None, show_memo_stats: bool = False, count_ops: bool = False,
+               record_bench: bool = True, resume: bool = False, verify_incremental: bool = False,
+               parse_cache: bool | None = None, solve_only: bool = False):
+    from timeit import repeat
+    from common import chunked_line_reader, configure_tracing, flush_traces, reset_memos, memo_stats, op_counts, \
+        enable_op_counters, disable_op_counters, tracing_enabled
     if part not in (1, 2):
         raise ValueError(f'Invalid part: {part}')
+    if trace is not None:
+        # must happen before the solution module is imported, that's when it fetches its tracer
+        configure_tracing(days=(day,), level=trace)
     if s_instance is None:
-        if isinstance(s_class, (str, NoneType)):
-            if not isinstance(s_module, ModuleType):
-                if s_module is None:
-                    s_module = f'day{day}'
-                s_module = import_module(f'{dir_names["solutions"]}.{s_module}')
-            if s_class is None:
-                s_class = f'Day{day}'
-                if version:
-                    s_class += f'V{version}'
-            s_class = getattr(s_module, s_class)
-        day_class: Type[Day] = s_class
-        # noinspection PyArgumentList
-        s_instance = day_class(**({} if s_inst_kwargs is None else s_inst_kwargs))
+        s_instance = load_solution(day, version, s_module, s_class, s_inst_kwargs)
+    reset_memos()
     solve_method: SolutionMethod = s_instance.solve_part1 if part == 1 else s_instance.solve_part2
+    stream_method = s_instance.get_stream_method(part) if stream else None
+    # parse_cache: True forces the parsed-input cache, False disables it, None uses it unless the solution can stream
+    parsed_method = s_instance.get_parsed_method(part) if parse_cache is not False and input_file != '-' else None
+    if parse_cache is None and not solve_only and stream_method is not None:
+        # streaming runs in constant memory, the cache needs the whole input in memory to hash it
+        parsed_method = None
+    if solve_only and time_iters and parsed_method is None:
+        print(f'Error: day {day} part {part} cannot be solved from a parsed input'
+              f'{"" if parse_cache is not False else " (parsed cache is disabled)"}')
+        return
 
     if input_file is None:
         input_file = f'd{day}.txt'
+    elif input_file == '-':
+        print('reading input from stdin')
     else:
         print(f'using alternative input file "{input_file}"')
     in_path = Path(path_prefix, dir_names['inputs'], input_file)
-    if not in_path.is_file():
+    if input_file != '-' and not in_path.is_file():
         print(f'Error: no input file found at "{in_path}"')
         return
-    with in_path.open(mode='rt', encoding='utf8', newline='\n') as f:
-        puzzle_input = f.read()
-    if time_iters is not None and time_iters > 0:
-        print(f'Benchmarking day {day} part {part}', '' if version is None else f' (ver {version})', sep='')
-        t = timeit(stmt=lambda: solve_method(input_str=puzzle_input), number=time_iters)
+    if count_ops:
+        enable_op_counters()
+        op_counts.clear()
+    if resume and input_file != '-':
+        run_resumable(s_instance, day, part, version, in_path, verify_incremental)
+    elif time_iters is not None and time_iters > 0:
+        if input_file == '-':
+            puzzle_input = sys.stdin.read()
+        else:
+            with in_path.open(mode='rt', encoding='utf8', newline='\n') as f:
+                puzzle_input = f.read()
+        print(f'Benchmarking day {day} part {part}', '' if version is None else f' (ver {version})',
+              ' (solve only)' if solve_only else '', sep='')
+        if solve_only:
+            parsed, _ = load_parsed_input(s_instance, in_path, puzzle_input)
+            samples = repeat(stmt=lambda: parsed_method(parsed=parsed), number=1, repeat=time_iters)
+            # recorded apart from full runs, the timings aren't comparable
+            version = f'{version or ""}+solveonly'
+        else:
+            samples = repeat(stmt=lambda: solve_method(input_str=puzzle_input), number=1, repeat=time_iters)
+        t = sum(samples)
         iter_ms = t * (1000 / time_iters)
         print(f'Ran {time_iters} iterations in {t:.3f}s')
         print(f'Iteration time: {iter_ms:.6f}ms')
+        if record_bench and (count_ops or tracing_enabled(day)):
+            # instrumentation slows the solution down, these timings would skew the history and its baselines
+            print('not recording benchmark: instrumented run (opcounts/trace)')
+        elif record_bench:
+            import benchmarks
+            benchmarks.record_result(day, part, version, puzzle_input, samples)
     else:
-        print(f'Solving day {day} part {part}', '' if version is None else f' (ver {version})', sep='')
-        start_time = time.time()
-        # noinspection PyArgumentList
-        solution_output = solve_method(input_str=puzzle_input)
-        elapsed_time = time.time() - start_time
+        print(f'Solving day {day} part {part}', '' if version is None else f' (ver {version})',
+              ' (parsed cache)' if parsed_method is not None else '' if stream_method is None else ' (streaming)',
+              sep='')
+        f = sys.stdin if input_file == '-' else in_path.open(mode='rt', encoding='utf8', newline='\n')
+        try:
+            if parsed_method is not None:
+                puzzle_input = f.read()
+                start_time = time.time()
+                parsed, cache_hit = load_parsed_input(s_instance, in_path, puzzle_input)
+                print('parsed input loaded from cache' if cache_hit else 'parsed input cached')
+                solution_output = parsed_method(parsed=parsed)
+            elif stream_method is not None:
+                # I/O is included in the time, reading overlaps with solving
+                start_time = time.time()
+                solution_output = stream_method(lines=chunked_line_reader(f))
+            else:
+                puzzle_input = f.read()
+                start_time = time.time()
+                # noinspection PyArgumentList
+                solution_output = solve_method(input_str=puzzle_input)
+            elapsed_time = time.time() - start_time
+        finally:
+            if f is not sys.stdin:
+                f.close()
         if isinstance(solution_output, str):
             print(f'Done in {elapsed_time:.3f}s, printing answer')
             print('=======================')
@@ -93,6 +211,396 @@ def run_puzzle(day: int, part: Literal[1, 2], version: str = None, s_module: str
             print(f'Done in {elapsed_time:.3f}s, returned None')
         else:
             print(f'Error: solution output is of invalid type: {type(solution_output)}')
+    if show_memo_stats:
+        for name, stats in memo_stats().items():
+            print(f'memo {name}: {stats}')
+    if count_ops:
+        disable_op_counters()
+        per_iter = time_iters if time_iters is not None and time_iters > 0 else 1
+        print('Operation counts', '' if per_iter == 1 else ' (per iteration)', ':', sep='')
+        for name, count in sorted(op_counts.items()):
+            print(f'  {name}: {count / per_iter:g}')
+    flush_traces()
+
+
+def _source_hash(*module_names: str) -> str:
+    import hashlib
+    h = hashlib.sha256()
+    for name in module_names:
+        h.update(Path(sys.modules[name].__file__).read_bytes())
+    return h.hexdigest()
+
+
+def load_parsed_input(s_instance: 'Day', in_path: Path, puzzle_input: str) -> tuple['ParsedInput', bool]:
+    """
+    Loads the solution's parsed input from the cache file next to the input, or parses and stores it if the cache is
+    missing or stale. The cache is keyed by the input's hash and the source of the solution module and common.
+    Returns (parsed input, whether it came from the cache)
+    """
+    import hashlib
+    from common import read_parsed_input, write_parsed_input
+    s_type = type(s_instance)
+    cache_path = in_path.with_name(f'.{in_path.name}.{s_type.__name__}.parsed')
+    key = hashlib.sha256(puzzle_input.encode('utf8')).hexdigest() + ':' + _source_hash(s_type.__module__, 'common')
+    parsed = read_parsed_input(cache_path, key)
+    if parsed is not None:
+        return parsed, True
+    parsed = s_instance.parse_to_buffers(puzzle_input)
+    write_parsed_input(cache_path, key, parsed)
+    return parsed, False
+
+
+def _prefix_hash(f, offset: int):
+    """
+    Running hash of all input bytes before offset, its digest is used to detect inputs that changed other than by
+    appending
+    """
+    import hashlib
+    h = hashlib.sha256()
+    f.seek(0)
+    remaining = offset
+    while remaining > 0 and (chunk := f.read(min(remaining, 1 << 20))):
+        h.update(chunk)
+        remaining -= len(chunk)
+    return h
+
+
+def run_resumable(s_instance: 'Day', day: int, part: Literal[1, 2], version: str | None, in_path: Path,
+                  verify: bool = False):
+    """
+    Solves an append-only input incrementally: the solution's resumable state is saved next to the input together with
+    the number of bytes consumed, so the next run only processes lines appended since.
+    """
+    import pickle
+    from copy import deepcopy
+    resume_method = s_instance.get_resume_method(part)
+    if resume_method is None:
+        print(f'Error: day {day} part {part} does not support resuming')
+        return
+    ckpt_path = in_path.with_name(f'.{in_path.name}.d{day}p{part}{"" if version is None else "v" + version}.ckpt')
+    # a checkpoint is only valid for the exact solution code that created it
+    s_type = type(s_instance)
+    solution_id = f'{s_type.__module__}.{s_type.__qualname__}:{_source_hash(s_type.__module__)}'
+
+    print(f'Solving day {day} part {part}', '' if version is None else f' (ver {version})', ' (incremental)', sep='')
+    with in_path.open(mode='rb') as f:
+        state, offset = None, 0
+        prefix_hash = _prefix_hash(f, 0)
+        if ckpt_path.is_file():
+            with ckpt_path.open(mode='rb') as cf:
+                ckpt = pickle.load(cf)
+            file_size = f.seek(0, 2)
+            ckpt_hash = _prefix_hash(f, ckpt['offset']) if ckpt['offset'] <= file_size else None
+            if ckpt['solution'] == solution_id and ckpt_hash is not None and ckpt_hash.hexdigest() == ckpt['anchor']:
+                state, offset, prefix_hash = ckpt['state'], ckpt['offset'], ckpt_hash
+                print(f'resuming from byte {offset}')
+            else:
+                print('checkpoint is stale, solving from the start')
+        f.seek(offset)
+        tail = f.read()
+        # only complete lines go into the checkpoint, an unterminated last line may still be growing
+        complete_len = tail.rfind(b'\n') + 1
+        lines = list(l.rstrip('\r') for l in tail[:complete_len].decode('utf8').split('\n')[:-1])
+        partial_line = tail[complete_len:].decode('utf8').rstrip('\r')
+
+        start_time = time.time()
+        solution_output, state = resume_method(state=state, lines=lines)
+        new_offset = offset + complete_len
+        prefix_hash.update(tail[:complete_len])
+        anchor = prefix_hash.hexdigest()
+        with ckpt_path.open(mode='wb') as cf:
+            pickle.dump({'solution': solution_id, 'offset': new_offset, 'anchor': anchor, 'state': state}, cf)
+        if partial_line:
+            solution_output, _ = resume_method(state=deepcopy(state), lines=[partial_line])
+        elapsed_time = time.time() - start_time
+    print(f'Done in {elapsed_time:.3f}s ({len(lines) + bool(partial_line)} new lines), printing answer')
+    print('=======================')
+    print(solution_output)
+    print('=======================')
+
+    if verify:
+        with in_path.open(mode='rt', encoding='utf8', newline='\n') as f:
+            puzzle_input = f.read()
+        solve_method: SolutionMethod = s_instance.solve_part1 if part == 1 else s_instance.solve_part2
+        full_output = solve_method(input_str=puzzle_input)
+        if full_output == solution_output:
+            print('Verified: incremental result matches a full recompute')
+        else:
+            print(f'Error: incremental result does not match a full recompute ({full_output})')
+
+
+def _limited_child(conn, time_limit: float | None, memory_limit: int | None, kwargs: dict, stdin_text: str | None):
+    import faulthandler
+    peak_rss = None
+    if hasattr(os, 'setsid'):
+        # own process group, so that pool workers started by the solution get killed along with this process
+        os.setsid()
+    if stdin_text is not None:
+        from io import StringIO
+        sys.stdin = StringIO(stdin_text)
+    try:
+        import resource
+    except ImportError:
+        resource = None
+        if memory_limit is not None:
+            print('Warning: memory limits are not supported on this platform')
+    if resource is not None and memory_limit is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (memory_limit, memory_limit))
+    if time_limit is not None:
+        # dumps the stack when the time runs out, right before the parent kills this process
+        faulthandler.dump_traceback_later(time_limit, exit=False)
+    try:
+        run_puzzle(**kwargs)
+        status = 'ok'
+    except MemoryError:
+        status = 'oom'
+    except Exception:
+        import traceback
+        traceback.print_exc()
+        status = 'error'
+    faulthandler.cancel_dump_traceback_later()
+    if resource is not None:
+        peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    sys.stdout.flush()
+    conn.send((status, peak_rss))
+    conn.close()
+
+
+def format_size(num_bytes: int) -> str:
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if num_bytes < 1024 or unit == 'GiB':
+            return f'{num_bytes:.1f}{unit}' if unit != 'B' else f'{num_bytes}B'
+        num_bytes /= 1024
+
+
+def parse_size(size: str) -> int:
+    multipliers = {'k': 1 << 10, 'm': 1 << 20, 'g': 1 << 30}
+    size = size.lower().rstrip('b')
+    if size and size[-1] in multipliers:
+        return int(float(size[:-1]) * multipliers[size[-1]])
+    return int(size)
+
+
+def _kill_process_group(proc):
+    if not hasattr(os, 'killpg'):
+        proc.kill()
+        return
+    import signal
+    try:
+        os.killpg(proc.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        pass
+
+
+def run_puzzle_limited(time_limit: float | None, memory_limit: int | None, **kwargs) -> str:
+    """
+    Runs run_puzzle() in a child process with a memory limit and kills it once the time limit is exceeded.
+    Returns the status: ok, timeout, oom, killed or error.
+    """
+    import multiprocessing
+    # the child's stdin is /dev/null, stdin input has to be read here and handed over
+    stdin_text = sys.stdin.read() if kwargs.get('input_file') == '-' else None
+    recv_conn, send_conn = multiprocessing.Pipe(duplex=False)
+    proc = multiprocessing.Process(target=_limited_child,
+                                   args=(send_conn, time_limit, memory_limit, kwargs, stdin_text))
+    start_time = time.time()
+    proc.start()
+    send_conn.close()
+    # grace period, so the child can dump its stack first
+    proc.join(None if time_limit is None else time_limit + 1)
+    elapsed_time = time.time() - start_time
+    status, peak_rss = 'killed', None
+    if proc.is_alive():
+        _kill_process_group(proc)
+        proc.join()
+        status = 'timeout'
+    elif recv_conn.poll():
+        status, peak_rss = recv_conn.recv()
+    recv_conn.close()
+    # a child that died early may have left pool workers behind
+    _kill_process_group(proc)
+    if peak_rss is None:
+        try:
+            import resource
+            peak_rss = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+        except ImportError:
+            pass
+    rss_info = '' if peak_rss is None else f', peak memory {format_size(peak_rss)}'
+    if status == 'timeout':
+        print(f'Error: timed out after {elapsed_time:.1f}s (limit {time_limit}s){rss_info}')
+    elif status == 'oom':
+        print(f'Error: out of memory after {elapsed_time:.1f}s (limit {format_size(memory_limit)}){rss_info}')
+    elif status == 'killed':
+        print(f'Error: solution process was killed after {elapsed_time:.1f}s (exit code {proc.exitcode}){rss_info}')
+    elif status == 'error':
+        print(f'Error: solution raised an exception after {elapsed_time:.1f}s{rss_info}')
+    return status
+
+
+_batch_solve_method: SolutionMethod | None = None
+
+
+def _batch_init(day: int, part: Literal[1, 2], version: str | None):
+    global _batch_solve_method
+    s_instance = load_solution(day, version)
+    _batch_solve_method = s_instance.solve_part1 if part == 1 else s_instance.solve_part2
+
+
+def _batch_solve(path: str) -> tuple[str | None, float, int, str | None]:
+    """ Returns (answer, solve time, input size, error), errors are reported instead of aborting the batch """
+    start_time = time.perf_counter()
+    size = 0
+    try:
+        with open(path, mode='rt', encoding='utf8', newline='\n') as f:
+            puzzle_input = f.read()
+        size = len(puzzle_input.encode('utf8'))
+        start_time = time.perf_counter()
+        # noinspection PyArgumentList
+        output = _batch_solve_method(input_str=puzzle_input)
+    except Exception as e:
+        return None, time.perf_counter() - start_time, size, f'{type(e).__name__}: {e}'
+    return output, time.perf_counter() - start_time, size, None
+
+
+def batch(args: list[str]) -> int:
+    """ Solves one part for many input files, usage: batch dN pM [verX] [workers=N] [expected=FILE] FILES... """
+    day = None
+    part: Literal[1, 2] = 1
+    ver: str | None = None
+    workers = 1
+    expected_file: str | None = None
+    paths: list[str] = []
+    for arg in args:
+        larg = arg.lower()
+        if larg.startswith('workers='):
+            workers = int(larg[8:])
+        elif larg.startswith('expected='):
+            expected_file = arg[9:]
+        elif larg.startswith('ver'):
+            ver = larg[3:]
+        elif len(larg) > 1 and larg[0] in 'dp' and larg[1:].isdigit():
+            if larg[0] == 'd':
+                day = int(larg[1:])
+            else:
+                # noinspection PyTypeChecker
+                part = int(larg[1:])
+        else:
+            # globs are expanded here as well, for shells that don't
+            from glob import glob
+            paths.extend(sorted(glob(arg)) if any(c in arg for c in '*?[') else [arg])
+    if day is None:
+        print('Error: must specify day number')
+        return 2
+    if part not in (1, 2):
+        print(f'Error: part must equal 1 or 2 ({part})')
+        return 2
+    if not paths:
+        print('Error: no input files')
+        return 2
+
+    expected: dict[str, str] = {}
+    if expected_file is not None:
+        # one "<input file> <answer>" per line, the file may be given by path or by name
+        with open(expected_file, mode='rt', encoding='utf8') as f:
+            for line in f:
+                if line.strip():
+                    name, answer = line.split(maxsplit=1)
+                    expected[name] = answer.strip()
+
+    print(f'Solving day {day} part {part}', '' if ver is None else f' (ver {ver})',
+          f' for {len(paths)} inputs', '' if workers <= 1 else f' with {workers} workers', sep='')
+    start_time = time.perf_counter()
+    if workers <= 1:
+        _batch_init(day, part, ver)
+        results = map(_batch_solve, paths)
+        executor = None
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_batch_init, initargs=(day, part, ver))
+        results = executor.map(_batch_solve, paths)
+    total_bytes = 0
+    mismatches = 0
+    errors = 0
+    try:
+        for path, (output, elapsed, size, error) in zip(paths, results):
+            total_bytes += size
+            if error is not None:
+                errors += 1
+                print(f'{path}: ERROR {error} ({elapsed * 1000:.3f}ms)')
+                continue
+            check = ''
+            exp = expected.get(path, expected.get(Path(path).name))
+            if exp is not None:
+                if output == exp:
+                    check = ' OK'
+                else:
+                    check = f' MISMATCH (expected {exp})'
+                    mismatches += 1
+            print(f'{path}: {output} ({elapsed * 1000:.3f}ms){check}')
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    wall_time = time.perf_counter() - start_time
+    print(f'Done in {wall_time:.3f}s: {len(paths) / wall_time:.2f} inputs/s, '
+          f'{total_bytes / (1 << 20) / wall_time:.3f} MB/s')
+    if errors:
+        print(f'{errors} inputs failed with an error')
+    if expected_file is not None:
+        print(f'{mismatches} mismatches' if mismatches else 'All checked answers match')
+    return 1 if mismatches or errors else 0
+
+
+def _import_times(code: str, samples: int = STARTUP_SAMPLES) -> tuple[float, dict[str, tuple[int, int]]]:
+    """
+    Runs code in a fresh interpreter several times, returns its wall time (ms) and module -> (self us, cumulative us).
+    Each measurement is the minimum over the samples, single runs are too noisy to compare or subtract.
+    """
+    import subprocess
+    wall_ms = float('inf')
+    modules: dict[str, tuple[int, int]] = {}
+    for _ in range(samples):
+        start_time = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', code], capture_output=True, text=True,
+                              cwd=Path(__file__).parent)
+        wall_ms = min(wall_ms, (time.perf_counter() - start_time) * 1000)
+        if proc.returncode != 0:
+            raise RuntimeError(f'startup measurement failed: {proc.stderr.strip().splitlines()[-1:]}')
+        for line in proc.stderr.splitlines():
+            if not line.startswith('import time:') or 'cumulative' in line:
+                continue
+            self_us, cumulative_us, name = line[12:].split('|')
+            name, times = name.strip(), (int(self_us), int(cumulative_us))
+            modules[name] = tuple(map(min, modules[name], times)) if name in modules else times
+    return wall_ms, modules
+
+
+def startup(args: list[str]) -> int:
+    """ Reports cold start times of the runner and of every solution, usage: startup [dN...] """
+    days = list(int(a[1:]) for a in args if a.lower().startswith('d'))
+    if not days:
+        days = list(discover_solutions())
+    base_ms, _ = _import_times('pass')
+    runner_ms, runner_modules = _import_times('import main')
+    print(f'interpreter: {base_ms:.1f}ms, runner: +{runner_ms - base_ms:.1f}ms '
+          f'(imports {runner_modules.get("main", (0, 0))[1] / 1000:.1f}ms)')
+    over_budget = 0
+    for day in days:
+        # import_module() isn't covered by -X importtime, so the solution module is imported directly first
+        wall_ms, modules = _import_times(f'import main, {dir_names["solutions"]}.day{day}; main.load_solution({day})')
+        extra = sorted(((m, t) for m, t in modules.items() if m not in runner_modules), key=lambda i: -i[1][0])
+        solution_us = modules.get(f'{dir_names["solutions"]}.day{day}', (0, 0))[1]
+        startup_ms = wall_ms - base_ms
+        status = 'ok' if startup_ms <= STARTUP_BUDGET_MS else 'OVER BUDGET'
+        over_budget += status != 'ok'
+        heaviest = ', '.join(f'{m} {t[0] / 1000:.1f}ms' for m, t in extra[:3])
+        print(f'day {day}: startup {startup_ms:.1f}ms [{status}], solution imports {solution_us / 1000:.1f}ms'
+              + (f' (heaviest: {heaviest})' if heaviest else ''))
+    return 1 if over_budget else 0
+
+
+def list_solutions():
+    for day, classes in discover_solutions().items():
+        print(f'day {day}: {", ".join(classes)}')
 
 
 def run(args: list[str]):
@@ -100,11 +608,25 @@ def run(args: list[str]):
     part: Literal[1, 2] = 1
     ver: str | None = None
     example_input = False
+    from_stdin = False
+    stream = True
+    trace: 'TraceLevel | None' = None
+    show_memo_stats = False
+    count_ops = False
+    record_bench = True
+    resume = False
+    verify_incremental = False
+    parse_cache: bool | None = None
+    solve_only = False
+    time_limit: float | None = None
+    memory_limit: int | None = None
     time_iters = None
     for arg in args:
         arg = arg.lower()
         if arg.startswith('d'):
             day = int(arg[1:])
+        elif arg == 'parsecache':
+            parse_cache = True
         elif arg.startswith('p'):
             # noinspection PyTypeChecker
             part = int(arg[1:])
@@ -115,13 +637,93 @@ def run(args: list[str]):
             ver = arg[3:]
         elif arg == 'e' or arg == 'exampleinput':
             example_input = True
+        elif arg == 'stdin' or arg == '-':
+            from_stdin = True
+        elif arg == 'nostream':
+            stream = False
+        elif arg == 'memostats':
+            show_memo_stats = True
+        elif arg == 'opcounts':
+            count_ops = True
+        elif arg == 'norecord':
+            record_bench = False
+        elif arg == 'noparsecache':
+            parse_cache = False
+        elif arg == 'solveonly':
+            solve_only = True
+        elif arg == 'resume':
+            resume = True
+        elif arg == '--verify-incremental' or arg == 'verifyincremental':
+            resume = verify_incremental = True
+        elif arg.startswith('timeout='):
+            time_limit = float(arg[8:].rstrip('s'))
+        elif arg.startswith('maxmem='):
+            memory_limit = parse_size(arg[7:])
+        elif arg.startswith('trace'):
+            from common import TraceLevel
+            trace = TraceLevel[arg[6:].capitalize()] if arg.startswith('trace=') else TraceLevel.Debug
         elif arg.startswith('t'):
             if arg == 't' or arg == 'time':
                 time_iters = 100
             else:
                 time_iters = int(arg[1:])
-    in_file = 'example_input.txt' if example_input else None
-    run_puzzle(day=day, part=part, version=ver, input_file=in_file, time_iters=time_iters)
+    in_file = '-' if from_stdin else 'example_input.txt' if example_input else None
+    run_kwargs = dict(day=day, part=part, version=ver, input_file=in_file, time_iters=time_iters, stream=stream,
+                      trace=trace, show_memo_stats=show_memo_stats, count_ops=count_ops, record_bench=record_bench,
+                      resume=resume, verify_incremental=verify_incremental, parse_cache=parse_cache,
+                      solve_only=solve_only)
+    if time_limit is None and memory_limit is None:
+        run_puzzle(**run_kwargs)
+    elif run_puzzle_limited(time_limit, memory_limit, **run_kwargs) != 'ok':
+        sys.exit(1)
+
+
+def bench(args: list[str]) -> int:
+    import benchmarks
+    if len(args) < 1:
+        print('Error: must specify a bench command (history, check, baseline)')
+        return 2
+    command = args[0].lower()
+    if command == 'history':
+        day, part = None, None
+        for arg in args[1:]:
+            arg = arg.lower()
+            if arg.startswith('d'):
+                day = int(arg[1:])
+            elif arg.startswith('p'):
+                part = int(arg[1:])
+        if day is None:
+            print('Error: must specify day number')
+            return 2
+        results = benchmarks.history(day, part)
+        if not results:
+            print(f'No benchmark results for day {day}')
+            return 0
+        print(f'{"date":<19} {"part":>4} {"ver":>4} {"input":<16} {"commit":<9} {"n":>5} {"median ms":>12} '
+              f'{"mean ms":>12} {"stdev ms":>10} {"base":>4}')
+        for r in results:
+            commit = '-' if r.git_commit is None else r.git_commit[:8] + ('*' if r.git_dirty else '')
+            print(f'{time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(r.timestamp))} {r.part:>4} {r.version:>4} '
+                  f'{r.input_hash:<16} {commit:<9} {r.sample_count:>5} {r.median_ms:>12.4f} {r.mean_ms:>12.4f} '
+                  f'{r.stdev_ms:>10.4f} {"yes" if r.baseline else "":>4}')
+        return 0
+    elif command == 'check':
+        regressions = benchmarks.check_regressions()
+        for reg in regressions:
+            cur = reg.current
+            print(f'Regression: day {cur.day} part {cur.part}', '' if not cur.version else f' (ver {cur.version})',
+                  f' median {reg.baseline_ms:.4f}ms -> {reg.current_ms:.4f}ms ({reg.ratio:.2f}x, p={reg.p_value:.2g}, '
+                  f'{reg.baseline_runs} vs {reg.current_runs} runs)', sep='')
+        if regressions:
+            return 1
+        print(f'No significant slowdowns (needs {benchmarks.MIN_RUNS} runs of both the baseline and the current '
+              f'commit)')
+        return 0
+    elif command == 'baseline':
+        print(f'Marked {benchmarks.mark_baseline()} results as baseline')
+        return 0
+    print(f'Unknown bench command: {args[0]}')
+    return 2
 
 
 if __name__ == '__main__':
@@ -131,6 +733,14 @@ if __name__ == '__main__':
             generate_new_day(argv[1:])
         elif argv[0].lower() == 'run':
             run(argv[1:])
+        elif argv[0].lower() == 'bench':
+            sys.exit(bench(argv[1:]))
+        elif argv[0].lower() == 'batch':
+            sys.exit(batch(argv[1:]))
+        elif argv[0].lower() == 'startup':
+            sys.exit(startup(argv[1:]))
+        elif argv[0].lower() == 'list':
+            list_solutions()
         else:
             print(f'Unknown command: {argv[0]}')
     else:
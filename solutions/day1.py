@@ -1,59 +1,93 @@
-import math
-import re
-from dataclasses import dataclass
-from typing import Literal
+from array import array
+from collections.abc import Iterable
+from itertools import accumulate, islice, pairwise
 
-from common import Day, line_iterator
+from common import Day, ParsedInput, line_iterator
 
 
-rotation_regex = re.compile(r'([R|L])(\d+)')
+class Dial:
+    __slots__ = ['position', 'zero_stops', 'zero_clicks']
 
-@dataclass
-class Rotation:
-    direction: Literal['R', 'L']
-    distance: int
+    def __init__(self, position: int = 50):
+        self.position = position
+        self.zero_stops = 0     # rotations that ended on 0
+        self.zero_clicks = 0    # times the dial pointed at 0, including in the middle of a rotation
+
+    def rotate_all(self, deltas: array | memoryview):
+        # Unwrapped positions, the dial points at 0 whenever one of them is a multiple of 100
+        positions = list(accumulate(deltas, initial=self.position))
+        self.zero_stops += sum(1 for p in islice(positions, 1, None) if p % 100 == 0)
+        # Right turns from o to n pass multiples of 100 in (o, n], left turns pass those in [n, o)
+        self.zero_clicks += sum((n // 100 - o // 100) if n > o else ((o - 1) // 100 - (n - 1) // 100)
+                                for o, n in pairwise(positions))
+        self.position = positions[-1] % 100
 
 
 class Day1(Day):
     @staticmethod
-    def parse_input(input_str: str) -> list[Rotation]:
-        rotations: list[Rotation] = []
-        for line in line_iterator(input_str):
-            r_match = rotation_regex.match(line)
-            rotations.append(Rotation(direction=r_match[1], distance=int(r_match[2])))
-        return rotations
+    def parse_input(input_str: str) -> array:
+        return Day1.parse_lines(line_iterator(input_str))
+
+    @staticmethod
+    def parse_lines(lines: Iterable[str]) -> array:
+        """ Signed rotation distances, positive for right turns """
+        deltas = array('q')
+        for line in lines:
+            if line[:1] == 'R':
+                deltas.append(int(line[1:]))
+            elif line[:1] == 'L':
+                deltas.append(-int(line[1:]))
+            else:
+                raise ValueError(f'Invalid rotation: {line}')
+        return deltas
 
     @staticmethod
-    def rotate(cur_pos: int, rotation: Rotation) -> int:
-        if rotation.direction == 'R':
-            cur_pos += rotation.distance
-        elif rotation.direction == 'L':
-            cur_pos -= rotation.distance
-        return cur_pos
+    def simulate_stream(lines: Iterable[str], chunk_lines: int = 1 << 16) -> Dial:
+        """ Rotates the dial chunk by chunk, so only chunk_lines rotations are kept in memory at a time """
+        dial = Dial()
+        lines = iter(lines)
+        while chunk := list(islice(lines, chunk_lines)):
+            dial.rotate_all(Day1.parse_lines(chunk))
+        return dial
 
     def solve_part1(self, input_str: str) -> str:
-        rotations = self.parse_input(input_str)
-        cur_pos = 50
-        zero_count: int = 0
-        for rotation in rotations:
-            cur_pos = self.rotate(cur_pos, rotation) % 100
-            if cur_pos == 0:
-                zero_count += 1
-        return str(zero_count)
+        dial = Dial()
+        dial.rotate_all(self.parse_input(input_str))
+        return str(dial.zero_stops)
 
     def solve_part2(self, input_str: str) -> str:
-        rotations = self.parse_input(input_str)
-        cur_pos = 50
-        click_count: int = 0
-        for rotation in rotations:
-            new_pos = self.rotate(cur_pos, rotation)
-            if rotation.direction == 'R':
-                click_count += new_pos // 100
-            else:
-                # subtracts 1 click if we started from 0
-                click_count += math.ceil((-new_pos + 1) / 100) - int(cur_pos == 0)
-            cur_pos = new_pos % 100
-        return str(click_count)
+        dial = Dial()
+        dial.rotate_all(self.parse_input(input_str))
+        return str(dial.zero_clicks)
+
+    def parse_to_buffers(self, input_str: str) -> ParsedInput:
+        return {'deltas': self.parse_input(input_str)}
+
+    def solve_part1_parsed(self, parsed: ParsedInput) -> str:
+        dial = Dial()
+        dial.rotate_all(parsed['deltas'])
+        return str(dial.zero_stops)
+
+    def solve_part2_parsed(self, parsed: ParsedInput) -> str:
+        dial = Dial()
+        dial.rotate_all(parsed['deltas'])
+        return str(dial.zero_clicks)
+
+    def solve_part1_stream(self, lines: Iterable[str]) -> str:
+        return str(self.simulate_stream(lines).zero_stops)
+
+    def solve_part2_stream(self, lines: Iterable[str]) -> str:
+        return str(self.simulate_stream(lines).zero_clicks)
+
+    def resume_part1(self, state: Dial | None, lines: Iterable[str]) -> tuple[str, Dial]:
+        dial = Dial() if state is None else state
+        dial.rotate_all(self.parse_lines(lines))
+        return str(dial.zero_stops), dial
+
+    def resume_part2(self, state: Dial | None, lines: Iterable[str]) -> tuple[str, Dial]:
+        dial = Dial() if state is None else state
+        dial.rotate_all(self.parse_lines(lines))
+        return str(dial.zero_clicks), dial
 
 
 if __name__ == '__main__':
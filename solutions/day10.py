@@ -1,11 +1,16 @@
 import re
-from itertools import combinations_with_replacement
+from collections.abc import Iterable
+from itertools import combinations
+from math import prod
 from typing import NamedTuple
 
-from common import Day, line_iterator
+from common import Day, line_iterator, parallel_map_reduce, parallel_map_reduce_stream
+from intlinear import minimize_sum
 
 
 line_regex = re.compile(r'\[([#.]+)] ((?:\(\d+(?:,\d+)*\) )+){(\d+(?:,\d+)*)}')
+# In units of Day10.joltage_cost, about 25us each, below this the worker startup outweighs the parallel speedup
+JOLTAGE_MIN_PARALLEL = 10000
 
 
 MachineButton = tuple[int, ...]
@@ -15,48 +20,126 @@ class MachineDescription(NamedTuple):
     buttons: tuple[MachineButton, ...]
     joltage: tuple[int, ...]
 
+    @property
+    def lights_mask(self) -> int:
+        return sum(1 << i for i, l in enumerate(self.lights) if l)
+
+    @property
+    def button_masks(self) -> tuple[int, ...]:
+        return tuple(sum(1 << i for i in set(b)) for b in self.buttons)
+
+
+def min_xor_combination(target: int, masks: tuple[int, ...]) -> int | None:
+    """ Smallest number of masks that XOR to target (each mask used at most once), None if impossible """
+    n = len(masks)
+    # One equation per bit of the target: variable bits 0..n-1, right-hand side at bit n
+    rows: list[int] = []
+    for bit in range(max(target.bit_length(), *(m.bit_length() for m in masks))):
+        row = sum(1 << i for i, m in enumerate(masks) if m >> bit & 1) | ((target >> bit & 1) << n)
+        rows.append(row)
+
+    # Gauss-Jordan elimination over GF(2)
+    pivots: list[int] = []
+    for c in range(n):
+        r = next((r for r in range(len(pivots), len(rows)) if rows[r] >> c & 1), None)
+        if r is None:
+            continue
+        rank = len(pivots)
+        rows[rank], rows[r] = rows[r], rows[rank]
+        for i in range(len(rows)):
+            if i != rank and rows[i] >> c & 1:
+                rows[i] ^= rows[rank]
+        pivots.append(c)
+    if any(rows[r] for r in range(len(pivots), len(rows))):
+        return None
+    free = [c for c in range(n) if c not in pivots]
+
+    if len(free) > n // 2:
+        return _min_xor_meet_in_the_middle(target, masks)
+
+    # Particular solution with all free variables unset, then walk the null space in Gray code order
+    x = sum(1 << c for r, c in enumerate(pivots) if rows[r] >> n & 1)
+    basis = [(1 << f) | sum(1 << c for r, c in enumerate(pivots) if rows[r] >> f & 1) for f in free]
+    best = x.bit_count()
+    for i in range(1, 1 << len(basis)):
+        x ^= basis[(i & -i).bit_length() - 1]
+        best = min(best, x.bit_count())
+    return best
+
+
+def _min_xor_meet_in_the_middle(target: int, masks: tuple[int, ...]) -> int | None:
+    half = len(masks) // 2
+    left: dict[int, int] = {}
+    for k in range(half + 1):
+        for combo in combinations(masks[:half], k):
+            acc = 0
+            for m in combo:
+                acc ^= m
+            left.setdefault(acc, k)
+    best = None
+    for k in range(len(masks) - half + 1):
+        for combo in combinations(masks[half:], k):
+            acc = target
+            for m in combo:
+                acc ^= m
+            if acc in left and (best is None or left[acc] + k < best):
+                best = left[acc] + k
+    return best
+
 
 class Day10(Day):
     @staticmethod
     def parse_input(input_str: str) -> list[MachineDescription]:
-        machines: list[MachineDescription] = []
-        for line in line_iterator(input_str):
-            line_match = line_regex.fullmatch(line)
-            lights = tuple(c == '#' for c in line_match[1])
-            buttons = tuple(tuple(int(n) for n in b[1:-1].split(',')) for b in line_match[2].strip().split(' '))
-            joltage = tuple(int(n) for n in line_match[3].split(','))
-            if len(lights) != len(joltage):
-                raise RuntimeError(f'Invalid input: the number of lights ({len(lights)}) and joltage requirements '
-                                   f'({len(joltage)}) do not match)')
-            machines.append(MachineDescription(lights, buttons, joltage))
-        return machines
+        return list(Day10.parse_line(line) for line in line_iterator(input_str))
 
     @staticmethod
-    def check_lights(light_len: int, buttons: tuple[MachineButton, ...]) -> tuple[bool, ...]:
-        res = [False] * light_len
-        for b in buttons:
-            for i in b:
-                res[i] = not res[i]
-        return tuple(res)
+    def parse_line(line: str) -> MachineDescription:
+        line_match = line_regex.fullmatch(line)
+        lights = tuple(c == '#' for c in line_match[1])
+        buttons = tuple(tuple(int(n) for n in b[1:-1].split(',')) for b in line_match[2].strip().split(' '))
+        joltage = tuple(int(n) for n in line_match[3].split(','))
+        if len(lights) != len(joltage):
+            raise RuntimeError(f'Invalid input: the number of lights ({len(lights)}) and joltage requirements '
+                               f'({len(joltage)}) do not match)')
+        return MachineDescription(lights, buttons, joltage)
+
+    @staticmethod
+    def configure_lights(md: MachineDescription) -> int:
+        presses = min_xor_combination(md.lights_mask, md.button_masks)
+        if presses is None:
+            raise RuntimeError(f'No button combination produces lights {md.lights}')
+        return presses
+
+    @staticmethod
+    def configure_joltage(md: MachineDescription) -> int:
+        matrix = [[int(i in b) for b in md.buttons] for i in range(len(md.joltage))]
+        presses = minimize_sum(matrix, md.joltage)
+        if presses is None:
+            raise RuntimeError(f'No button combination produces joltage {md.joltage}')
+        return sum(presses)
+
+    @staticmethod
+    def joltage_cost(md: MachineDescription) -> int:
+        """ Rough size of configure_joltage's search, the product of the bounds of the free presses it branches on """
+        bounds = sorted(min(md.joltage[i] for i in b) for b in md.buttons)
+        # at least buttons - counters presses are free, the search tries the tightest bounded first, the last is solved
+        return prod(b + 1 for b in bounds[:max(0, len(md.buttons) - len(md.joltage) - 1)])
 
     def solve_part1(self, input_str: str) -> str:
         machine_descriptions = self.parse_input(input_str)
-        res = 0
-        for md in machine_descriptions:
-            done = False
-            seq_len = 1
-            while not done:
-                for sequence in combinations_with_replacement(md.buttons, seq_len):
-                    if Day10.check_lights(len(md.lights), sequence) == md.lights:
-                        res += len(sequence)
-                        done = True
-                        break
-                seq_len += 1
-        return str(res)
+        return str(parallel_map_reduce(Day10.configure_lights, machine_descriptions, min_parallel=512))
 
     def solve_part2(self, input_str: str) -> str:
         machine_descriptions = self.parse_input(input_str)
-        return None
+        return str(parallel_map_reduce(Day10.configure_joltage, machine_descriptions, min_parallel=JOLTAGE_MIN_PARALLEL,
+                                       cost=Day10.joltage_cost))
+
+    def solve_part1_stream(self, lines: Iterable[str]) -> str:
+        return str(parallel_map_reduce_stream(Day10.configure_lights, map(Day10.parse_line, lines), min_parallel=512))
+
+    def solve_part2_stream(self, lines: Iterable[str]) -> str:
+        return str(parallel_map_reduce_stream(Day10.configure_joltage, map(Day10.parse_line, lines),
+                                              min_parallel=JOLTAGE_MIN_PARALLEL, cost=Day10.joltage_cost))
 
 
 if __name__ == '__main__':
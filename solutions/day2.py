@@ -1,16 +1,13 @@
 import re
 from collections.abc import Iterable, Iterator
-from dataclasses import dataclass
-from functools import cache
-from itertools import batched
-from math import log10, sqrt
+from math import sqrt
 
-from common import Day
+from common import Day, parallel_map_reduce, memoize
 
 range_regex = re.compile(r'(\d+)-(\d+)')
 
 
-@cache
+@memoize(max_size=256, int_domain=64)
 def iter_divs(num: int) -> Iterable[int]:
     divs = set()
     for d in range(1, int(sqrt(num)) + 1):
@@ -21,17 +18,41 @@ def iter_divs(num: int) -> Iterable[int]:
     return sorted(divs)
 
 
-@dataclass
+def mobius(num: int) -> int:
+    res = 1
+    p = 2
+    while p * p <= num:
+        if num % p == 0:
+            num //= p
+            if num % p == 0:
+                return 0
+            res = -res
+        p += 1
+    return -res if num > 1 else res
+
+
+def sum_periodic(low: int, high: int, digit_count: int, period: int) -> int:
+    """ Sum of all digit_count-digit numbers in [low, high] made of a period-digit pattern repeated """
+    # Such numbers are pattern * 0..010..010..01 (the repunit multiplier), with pattern having exactly period digits
+    multiplier = (10 ** digit_count - 1) // (10 ** period - 1)
+    p_low = max(10 ** (period - 1), -(-low // multiplier))
+    p_high = min(10 ** period - 1, high // multiplier)
+    if p_low > p_high:
+        return 0
+    return multiplier * (p_low + p_high) * (p_high - p_low + 1) // 2
+
+
 class IDRange(Iterable):
-    min: int
-    max: int
+    __slots__ = ['min', 'max']
 
-    @property
-    def digit_count(self) -> int | None:
-        dc = int(log10(abs(self.min))) + 1
-        if dc != int(log10(abs(self.max))) + 1:
-            return None
-        return dc
+    def __init__(self, min: int, max: int):
+        self.min = min
+        self.max = max
+
+    def split_by_digit_count(self) -> Iterator[tuple[int, int, int]]:
+        """ Yields (digit_count, low, high) sub-ranges that only contain numbers of the same length """
+        for dc in range(len(str(self.min)), len(str(self.max)) + 1):
+            yield dc, max(self.min, 10 ** (dc - 1)), min(self.max, 10 ** dc - 1)
 
     def __iter__(self) -> Iterator[int]:
         return iter(range(self.min, self.max + 1))
@@ -47,41 +68,25 @@ class Day2(Day):
         return ranges
 
     @staticmethod
-    def is_invalid_p1(pid: int, digit_count: int) -> bool:
-        if digit_count % 2 != 0:
-            return False
-        div = 10 ** (digit_count // 2)
-        return pid // div == pid % div
+    def sum_invalid_p1(rang: IDRange) -> int:
+        return sum(sum_periodic(low, high, dc, dc // 2) for dc, low, high in rang.split_by_digit_count() if dc % 2 == 0)
 
     @staticmethod
-    def is_invalid_p2(pid: int, digit_count: int) -> bool:
-        s = str(pid)
-        for d in iter_divs(digit_count):
-            batches = batched(s, d, strict=True)
-            first = next(batches)
-            if all(b == first for b in batches):
-                return True
-        return False
+    def sum_invalid_p2(rang: IDRange) -> int:
+        res = 0
+        for dc, low, high in rang.split_by_digit_count():
+            # A number repeating a pattern of length d also repeats patterns of length k*d, so group numbers by their
+            # shortest pattern, which gives the union over all patterns via Mobius inversion
+            res -= sum(mobius(dc // d) * sum_periodic(low, high, dc, d) for d in iter_divs(dc))
+        return res
 
     def solve_part1(self, input_str: str) -> str:
         ranges = self.parse_input(input_str)
-        res = 0
-        for rang in ranges:
-            dc = rang.digit_count
-            for pid in rang:
-                if Day2.is_invalid_p1(pid, (int(log10(abs(pid))) + 1) if dc is None else dc):
-                    res += pid
-        return str(res)
+        return str(parallel_map_reduce(Day2.sum_invalid_p1, ranges))
 
     def solve_part2(self, input_str: str) -> str:
         ranges = self.parse_input(input_str)
-        res = 0
-        for rang in ranges:
-            dc = rang.digit_count
-            for pid in rang:
-                if Day2.is_invalid_p2(pid, (int(log10(abs(pid))) + 1) if dc is None else dc):
-                    res += pid
-        return str(res)
+        return str(parallel_map_reduce(Day2.sum_invalid_p2, ranges))
 
 
 if __name__ == '__main__':
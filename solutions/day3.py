@@ -1,55 +1,94 @@
-from common import Day, line_iterator
+import sys
+from collections.abc import Iterable
+from functools import partial
+
+from common import Day, line_iterator, parallel_map_reduce, parallel_map_reduce_stream
+
+
+GREEDY_MAX_DIGITS = 16
+INT_CHUNK_DIGITS = 1000
+
+
+def int_to_str(num: int) -> str:
+    """ str(num) for non-negative ints of any length, str() itself is limited to sys.get_int_max_str_digits() """
+    limit = sys.get_int_max_str_digits()
+    # 3 bits per digit underestimates the digit count, so this stays below the limit
+    if not limit or num.bit_length() <= 3 * limit:
+        return str(num)
+    half = num.bit_length() * 3 // 20       # about half of the digits (log10(2) > 0.3)
+    high, low = divmod(num, 10 ** half)
+    return int_to_str(high) + int_to_str(low).zfill(half)
 
 
 class Day3(Day):
     @staticmethod
-    def parse_input(input_str: str) -> list[list[int]]:
-        banks: list[list[int]] = []
-        for line in line_iterator(input_str):
-            banks.append(list(map(int, line)))
-        return banks
+    def parse_input(input_str: str) -> list[bytes]:
+        return list(Day3.parse_lines(line_iterator(input_str)))
 
     @staticmethod
-    def largest_num(bank: list[int], digits: int, min_index: int = 0, mdv: int = 9) -> tuple[int, int] | None:
-        # Recursive function
+    def parse_lines(lines: Iterable[str]) -> Iterable[bytes]:
+        for line in lines:
+            if not line.isdigit():
+                raise ValueError(f'Invalid bank: {line}')
+            yield line.encode('ascii')
+
+    @staticmethod
+    def largest_digits(bank: bytes, digits: int) -> bytes | None:
+        """ Digits of the largest number formed by picking digits from the bank in order """
         if len(bank) < digits or digits == 0:
             return None
-        # Special case: find 1 digit
-        if digits == 1:
-            val, ind = -1, None
-            for i in range(min_index, len(bank)):
-                if val < bank[i] <= mdv:
-                    val = bank[i]
-                    ind = i
-            return None if ind is None else (val, ind)
-        # Find the next digit first, then the rest recursively
-        while True:
-            first_digit = Day3.largest_num(bank, 1, min_index, mdv)
-            if first_digit is None:
-                return None
-            rest_digits = Day3.largest_num(bank, digits - 1, first_digit[1] + 1)
-            if rest_digits is None:
-                mdv = first_digit[0] - 1
-                continue
-            return first_digit[0] * (10 ** (digits - 1)) + rest_digits[0], rest_digits[1]
+        if digits <= GREEDY_MAX_DIGITS:
+            # Few digits: the largest digit that still leaves room for the rest, found with C-level max/index
+            picked = bytearray()
+            start = 0
+            for remaining in range(digits - 1, -1, -1):
+                d = max(bank[start:len(bank) - remaining])
+                start = bank.index(d, start) + 1
+                picked.append(d)
+            return bytes(picked)
+        # Monotonic stack, O(len(bank)): a smaller digit gets replaced by a larger one that follows it, for as long
+        # as enough digits remain to fill all positions
+        drops = len(bank) - digits
+        stack = bytearray()
+        for d in bank:
+            while drops and stack and stack[-1] < d:
+                stack.pop()
+                drops -= 1
+            stack.append(d)
+        del stack[digits:]
+        return bytes(stack)
+
+    @staticmethod
+    def largest_num(bank: bytes, digits: int) -> int | None:
+        num = Day3.largest_digits(bank, digits)
+        if num is None:
+            return None
+        # Accumulated in chunks, int() refuses to parse digit strings longer than sys.get_int_max_str_digits()
+        res = 0
+        for i in range(0, len(num), INT_CHUNK_DIGITS):
+            chunk = num[i:i + INT_CHUNK_DIGITS]
+            res = res * 10 ** len(chunk) + int(chunk)
+        return res
+
+    @staticmethod
+    def bank_joltage(bank: bytes, digits: int) -> int:
+        jtg = Day3.largest_num(bank, digits)
+        return 0 if jtg is None else jtg
 
     def solve_part1(self, input_str: str) -> str:
         banks = self.parse_input(input_str)
-        res = 0
-        for bank in banks:
-            jtg = Day3.largest_num(bank, 2)
-            if jtg is not None:
-                res += jtg[0]
-        return str(res)
+        return int_to_str(parallel_map_reduce(partial(Day3.bank_joltage, digits=2), banks))
 
     def solve_part2(self, input_str: str) -> str:
         banks = self.parse_input(input_str)
-        res = 0
-        for bank in banks:
-            jtg = Day3.largest_num(bank, 12)
-            if jtg is not None:
-                res += jtg[0]
-        return str(res)
+        return int_to_str(parallel_map_reduce(partial(Day3.bank_joltage, digits=12), banks))
+
+    def solve_part1_stream(self, lines: Iterable[str]) -> str:
+        return int_to_str(parallel_map_reduce_stream(partial(Day3.bank_joltage, digits=2), self.parse_lines(lines)))
+
+    def solve_part2_stream(self, lines: Iterable[str]) -> str:
+        return int_to_str(parallel_map_reduce_stream(partial(Day3.bank_joltage, digits=12),
+                                                        self.parse_lines(lines)))
 
 
 if __name__ == '__main__':
@@ -1,6 +1,50 @@
-from collections import deque
+from common import Day, ParsedInput, line_iterator, Grid, LGrid, GridPeeler, GridTile, TiledGrid, DIRECTIONS_ALL
 
-from common import Day, line_iterator, LGrid, DIRECTIONS_ALL, Vector
+PAPER_ROLL = ord('@')
+# state plane value of cells that aren't (or are no longer) paper rolls
+REMOVED = 0xFF
+NEIGHBOUR_DELTAS = tuple(d.value for d in DIRECTIONS_ALL)
+
+
+def _count_accessible_tile(tile: GridTile) -> int:
+    peeler = GridPeeler(tile.as_grid(), PAPER_ROLL)
+    return len(peeler.below(4, tile.own_rows))
+
+
+def _remove_accessible_tile(tile: GridTile, seeds: list[int] | None) -> tuple[int, list[int]]:
+    """
+    First call: peels the tile's own rows with its halo rows held fixed, and keeps every own cell's neighbour count
+    (or REMOVED) in state plane 1. Later calls continue from that state, seeded with halo cells that other tiles removed
+    """
+    if seeds is None:
+        peeler = GridPeeler(tile.as_grid(), PAPER_ROLL)
+        removed = peeler.peel(4, tile.own_rows)
+        if not tile.has_neighbours:
+            return len(removed), []
+        counts, w = tile.plane(1), tile.width
+        for y in tile.own_rows:
+            start = (y + 1) * peeler.stride + 1
+            row = zip(peeler.present[start:start + w], peeler.counts[start:start + w])
+            counts[(y + tile.top) * w:(y + tile.top + 1) * w] = bytes(c if p else REMOVED for p, c in row)
+        changed = [(i // peeler.stride - 1 + tile.top) * w + i % peeler.stride - 1 for i in removed]
+        return len(changed), tile.edge_cells(changed)
+
+    counts, w = tile.plane(1), tile.width
+    lo, hi = tile.y_from * w, tile.y_to * w
+    changed: list[int] = []
+    queue = list(seeds)
+    for qi, c in enumerate(queue):
+        x = c % w
+        for dx, dy in NEIGHBOUR_DELTAS:
+            n = c + dy * w + dx
+            if lo <= n < hi and 0 <= x + dx < w and counts[n] != REMOVED:
+                if counts[n] <= 4:
+                    counts[n] = REMOVED
+                    changed.append(n)
+                    queue.append(n)
+                else:
+                    counts[n] -= 1
+    return len(changed), tile.edge_cells(changed)
 
 
 class Day4(Day):
@@ -11,29 +55,39 @@ class Day4(Day):
             grid.add_line(list(line))
         return grid
 
+    @staticmethod
+    def count_accessible(grid: Grid) -> int:
+        with TiledGrid(grid) as tiled:
+            return tiled.map_reduce(_count_accessible_tile)
+
+    @staticmethod
+    def remove_all_accessible(grid: Grid) -> int:
+        with TiledGrid(grid, planes=1) as tiled:
+            return tiled.until_stable(_remove_accessible_tile)
+
+    @staticmethod
+    def grid_from_buffers(parsed: ParsedInput) -> Grid[int]:
+        cells, width = parsed['cells'], parsed['width']
+        grid: Grid[int] = Grid()
+        for start in range(0, len(cells), width):
+            grid.add_line(cells[start:start + width])
+        return grid
+
     def solve_part1(self, input_str: str) -> str:
-        grid = self.parse_input(input_str)
-        res = 0
-        for l, item in grid.scan_all():
-            if item != '@':
-                continue
-            adjacent_roll_count = sum(int(v == '@') for _, v in grid.look_around(l, DIRECTIONS_ALL))
-            if adjacent_roll_count < 4:
-                res += 1
-        return str(res)
+        return str(self.count_accessible(self.parse_input(input_str)))
 
     def solve_part2(self, input_str: str) -> str:
+        return str(self.remove_all_accessible(self.parse_input(input_str)))
+
+    def parse_to_buffers(self, input_str: str) -> ParsedInput:
         grid = self.parse_input(input_str)
-        res = 0
-        to_scan: set[Vector] = set(v for v, it in grid.scan_all() if it == '@')
-        while len(to_scan) > 0:
-            l = to_scan.pop()
-            adjacent = list(al for al, ai in grid.look_around(l, DIRECTIONS_ALL) if ai == '@')
-            if len(adjacent) < 4:
-                grid.set_cell(l, '.')
-                res += 1
-                to_scan.update(adjacent)
-        return str(res)
+        return {'cells': b''.join(''.join(line).encode('latin-1') for line in grid.lines), 'width': grid.width}
+
+    def solve_part1_parsed(self, parsed: ParsedInput) -> str:
+        return str(self.count_accessible(self.grid_from_buffers(parsed)))
+
+    def solve_part2_parsed(self, parsed: ParsedInput) -> str:
+        return str(self.remove_all_accessible(self.grid_from_buffers(parsed)))
 
 
 if __name__ == '__main__':
@@ -1,8 +1,10 @@
 import re
-from collections.abc import Iterator
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterator, Iterable
 from typing import Self
 
-from common import Day, line_iterator
+from common import Day, ParsedInput, line_iterator
 
 
 range_regex = re.compile(r'(\d+)-(\d+)')
@@ -42,21 +44,69 @@ class Range:
         return self.high - self.low + 1
 
 
+class FreshIdCounter:
+    """ Counts fresh ingredient IDs, fed with the input's lines in any number of parts """
+    __slots__ = ['ranges', 'lows', 'ranges_done', 'fresh_count']
+
+    def __init__(self):
+        self.ranges: list[Range] = []
+        self.lows: list[int] = []
+        self.ranges_done = False
+        self.fresh_count = 0
+
+    def feed(self, lines: Iterable[str]):
+        for line in lines:
+            if self.ranges_done:
+                self.add_id(int(line))
+            elif line == '':
+                self.ranges_done = True
+                self.ranges = Day5.merge_ranges(self.ranges)
+                self.lows = list(r.low for r in self.ranges)
+            else:
+                self.ranges.append(Day5.parse_range(line))
+
+    def add_id(self, ing_id: int):
+        ri = bisect_right(self.lows, ing_id) - 1
+        if ri >= 0 and ing_id in self.ranges[ri]:
+            self.fresh_count += 1
+
+
 class Day5(Day):
     @staticmethod
     def parse_input(input_str: str) -> tuple[list[Range], list[int]]:
-        ranges: list[Range] = []
         available: list[int] = []
         li = line_iterator(input_str)
-        for line in li:
-            if line == '':
-                break
-            range_match = range_regex.fullmatch(line)
-            ranges.append(Range(int(range_match[1]), int(range_match[2])))
+        ranges = Day5.parse_ranges(li)
         for line in li:
             available.append(int(line))
         return ranges, available
 
+    @staticmethod
+    def parse_ranges(lines: Iterator[str]) -> list[Range]:
+        """ Consumes range lines up to and including the empty separator line """
+        ranges: list[Range] = []
+        for line in lines:
+            if line == '':
+                break
+            ranges.append(Day5.parse_range(line))
+        return ranges
+
+    @staticmethod
+    def parse_range(line: str) -> Range:
+        range_match = range_regex.fullmatch(line)
+        return Range(int(range_match[1]), int(range_match[2]))
+
+    @staticmethod
+    def merge_ranges(ranges: Iterable[Range]) -> list[Range]:
+        """ Merges overlapping ranges, the result is sorted """
+        merged: list[Range] = []
+        for r in sorted(ranges, key=lambda r: r.low):
+            if merged and merged[-1].overlaps(r):
+                merged[-1] = merged[-1].combine(r)
+            else:
+                merged.append(r)
+        return merged
+
     def solve_part1(self, input_str: str) -> str:
         ranges, available = self.parse_input(input_str)
         res = 0
@@ -69,29 +119,39 @@ class Day5(Day):
 
     def solve_part2(self, input_str: str) -> str:
         ranges, _ = self.parse_input(input_str)
+        ranges = self.merge_ranges(ranges)
+        res = sum(len(r) for r in ranges)
+        return str(res)
 
-        while True:
-            merge_count: int = 0
-            new_ranges: list[Range] = []
-            for r in ranges:
-                merged = False
-                for i in range(len(new_ranges)):
-                    nr = new_ranges[i]
-                    if nr.overlaps(r):
-                        new_ranges[i] = nr.combine(r)
-                        merged = True
-                        break
-                if merged:
-                    merge_count += 1
-                else:
-                    new_ranges.append(r)
-            ranges = new_ranges
-            if merge_count == 0:
-                break
+    def parse_to_buffers(self, input_str: str) -> ParsedInput:
+        """ Merged ranges as parallel arrays of low and high ends, plus the available IDs """
+        ranges, available = self.parse_input(input_str)
+        ranges = self.merge_ranges(ranges)
+        return {'lows': array('q', (r.low for r in ranges)), 'highs': array('q', (r.high for r in ranges)),
+                'available': array('q', available)}
 
-        res = sum(len(r) for r in ranges)
+    def solve_part1_parsed(self, parsed: ParsedInput) -> str:
+        lows, highs = parsed['lows'], parsed['highs']
+        res = 0
+        for ing_id in parsed['available']:
+            ri = bisect_right(lows, ing_id) - 1
+            if ri >= 0 and ing_id <= highs[ri]:
+                res += 1
         return str(res)
 
+    def solve_part2_parsed(self, parsed: ParsedInput) -> str:
+        return str(sum(parsed['highs']) - sum(parsed['lows']) + len(parsed['lows']))
+
+    def solve_part1_stream(self, lines: Iterable[str]) -> str:
+        counter = FreshIdCounter()
+        counter.feed(lines)
+        return str(counter.fresh_count)
+
+    def resume_part1(self, state: FreshIdCounter | None, lines: Iterable[str]) -> tuple[str, FreshIdCounter]:
+        counter = FreshIdCounter() if state is None else state
+        counter.feed(lines)
+        return str(counter.fresh_count), counter
+
 
 if __name__ == '__main__':
     from main import run_puzzle
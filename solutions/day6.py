@@ -1,20 +1,53 @@
 import operator
-from dataclasses import dataclass
+import re
+from collections.abc import Iterator
 from functools import reduce
-from typing import Literal
+from typing import Literal, NamedTuple
 
 from common import Day
 
 
-@dataclass
-class MathProblem:
+class MathProblem(NamedTuple):
     operator: Literal['+', '*']
     nums: list[int]
 
 
+class Worksheet:
+    """ Worksheet rows padded to equal width and stored in one flat byte buffer """
+    _non_space = bytes(int(c != ord(' ')) for c in range(256))
+
+    def __init__(self, input_str: str):
+        lines = list(l.rstrip() for l in input_str.split('\n') if l.rstrip() != '')
+        self.width = max(len(l) for l in lines)
+        self.height = len(lines) - 1
+        self.nums = b''.join(l.encode('ascii').ljust(self.width) for l in lines[:-1])
+        self.ops = lines[-1].encode('ascii').ljust(self.width)
+
+    def row(self, y: int, x_from: int = 0, x_to: int = None) -> bytes:
+        start = y * self.width
+        return self.nums[start + x_from:start + (self.width if x_to is None else x_to)]
+
+    def column(self, x: int) -> bytes:
+        return self.nums[x::self.width]
+
+    def problem_spans(self) -> Iterator[tuple[int, int, str]]:
+        """ Yields (x_from, x_to, operator) of every problem, problems are separated by columns of spaces """
+        # OR all rows together as big integers with one byte per column, separators end up as zero bytes
+        occupied = 0
+        for y in range(self.height):
+            occupied |= int.from_bytes(self.row(y).translate(self._non_space))
+        occupied |= int.from_bytes(self.ops.translate(self._non_space))
+        for m in re.finditer(rb'[^\x00]+', occupied.to_bytes(self.width)):
+            opr = self.ops[m.start():m.end()].strip().decode('ascii')
+            if opr not in ('+', '*'):
+                raise ValueError(f'Invalid operator "{opr}" (column {m.start()})')
+            yield m.start(), m.end(), opr
+
+
 class Day6(Day):
     @staticmethod
     def parse_input_part1(input_str: str) -> list[MathProblem]:
+        # Row-wise numbers are whitespace separated, splitting beats going through the Worksheet
         lines = list(l.split() for l in input_str.split('\n') if len(l.strip()) > 0)
         problems: list[MathProblem] = []
         for items in zip(*lines, strict=True):
@@ -23,24 +56,9 @@ class Day6(Day):
 
     @staticmethod
     def parse_input_part2(input_str: str) -> list[MathProblem]:
-        lines = list(l.rstrip() for l in input_str.split('\n') if l.rstrip() != '')
-        line_length = max(len(l) for l in lines)
-        for i in range(len(lines)):
-            lines[i] = lines[i].ljust(line_length, ' ')
-        nums_lns = lines[:-1]
-        ops_line = lines[-1]
-        problems: list[MathProblem] = []
-        lgi = line_length
-        for i in range(line_length - 1, -1, -1):
-            if ops_line[i] == ' ':
-                continue
-            opr = ops_line[i]
-            if opr not in ('+', '*'):
-                raise ValueError(f'Invalid operator "{opr}" (column {i})')
-            nums = list(int(''.join(nl[j] for nl in nums_lns if nl[j] != ' ')) for j in range(lgi - 1, i - 1, -1))
-            problems.append(MathProblem(opr, nums))
-            lgi = i - 1
-        return problems
+        ws = Worksheet(input_str)
+        return list(MathProblem(opr, list(int(ws.column(x).replace(b' ', b'')) for x in range(x_from, x_to)))
+                    for x_from, x_to, opr in ws.problem_spans())
 
     @staticmethod
     def solve_all(problems: list[MathProblem]) -> int:
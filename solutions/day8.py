@@ -1,140 +1,150 @@
 import heapq
-import math
-from collections.abc import Generator
-from functools import reduce
-from itertools import combinations
+from array import array
+from collections.abc import Iterable, Iterator
+from math import prod
 from typing import NamedTuple, Self
 
-from common import Day, line_iterator
+from common import Day, ParsedInput, line_iterator
 
 
-class Vector3D(NamedTuple):
-    x: int
-    y: int
-    z: int
-
-    @property
-    def manhattan_distance(self) -> int:
-        return abs(self.x) + abs(self.y) + abs(self.z)
-
-    @property
-    def euclidean_dist_square(self) -> int:
-        return (self.x * self.x) + (self.y * self.y) + (self.z * self.z)
-
-    @property
-    def euclidean_dist(self) -> float:
-        return math.sqrt(self.euclidean_dist_square)
-
-    def __add__(self, other: Self):
-        return Vector3D(self.x + other.x, self.y + other.y, self.z + other.z)
-
-    def __sub__(self, other: Self):
-        return Vector3D(self.x - other.x, self.y - other.y, self.z - other.z)
-
-    def __repr__(self):
-        return f'Vector3D({self.x}, {self.y}, {self.z})'
-
-    def __eq__(self, other: Self):
-        return self.x == other.x and self.y == other.y and self.z == other.z
-
-    def __hash__(self) -> int:
-        return hash((self.x, self.y, self.z))
-
 class JuncBoxPair(NamedTuple):
-    box1: Vector3D
-    box2: Vector3D
+    box1: int
+    box2: int
     distance_squared: int
 
-class JuncBoxCircuit:
-    def __init__(self, boxes: Vector3D | set[Vector3D]):
-        if isinstance(boxes, Vector3D):
-            self.boxes: set[Vector3D] = {boxes}
-        else:
-            self.boxes = boxes
-
-    def connect_to(self, other: Self) -> Self:
-        return JuncBoxCircuit(self.boxes | other.boxes)
 
-    def __len__(self):
-        return len(self.boxes)
-
-    def __hash__(self):
-        return hash(tuple(self.boxes))
+class PointCloud3D:
+    """
+    Points stored as three parallel int64 arrays, points are referred to by their index. Memoryviews cast to 'q'
+    work as columns too
+    """
+    __slots__ = ['xs', 'ys', 'zs']
+
+    def __init__(self, xs: array | memoryview | None = None, ys: array | memoryview | None = None,
+                 zs: array | memoryview | None = None):
+        self.xs = array('q') if xs is None else xs
+        self.ys = array('q') if ys is None else ys
+        self.zs = array('q') if zs is None else zs
+        if not len(self.xs) == len(self.ys) == len(self.zs):
+            raise ValueError('coordinate arrays must have the same length')
+
+    @classmethod
+    def from_lines(cls, lines: Iterable[str]) -> Self:
+        """ Parses 'x,y,z' lines all at once """
+        text = ','.join(lines)
+        values = array('q', map(int, text.split(','))) if text else array('q')
+        if len(values) % 3 != 0:
+            raise ValueError('every point needs exactly 3 coordinates')
+        return cls(values[0::3], values[1::3], values[2::3])
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def point(self, i: int) -> tuple[int, int, int]:
+        return self.xs[i], self.ys[i], self.zs[i]
+
+    def differences(self, i: int, start: int = 0) -> tuple[list[int], list[int], list[int]]:
+        """ Per-axis differences between points start.. and point i """
+        x, y, z = self.point(i)
+        return ([v - x for v in self.xs[start:]], [v - y for v in self.ys[start:]],
+                [v - z for v in self.zs[start:]])
+
+    def squared_distances(self, i: int, start: int = 0) -> list[int]:
+        """ Squared euclidean distances from point i to points start.. """
+        dx, dy, dz = self.differences(i, start)
+        return [a * a + b * b + c * c for a, b, c in zip(dx, dy, dz)]
+
+    def pairs_by_distance(self, limit: int | None = None) -> Iterator[JuncBoxPair]:
+        """ All pairs of distinct points in order of distance, or only the limit closest ones """
+        # Pairs are packed into single ints ordered by distance first, which sort much faster than tuples
+        bits = max(len(self) - 1, 1).bit_length()
+        keys: list[int] = []
+        for i in range(len(self) - 1):
+            base = i << bits
+            keys.extend(d << 2 * bits | base | j
+                        for j, d in enumerate(self.squared_distances(i, i + 1), i + 1))
+        keys = sorted(keys) if limit is None else heapq.nsmallest(limit, keys)
+        mask = (1 << bits) - 1
+        for key in keys:
+            yield JuncBoxPair(key >> bits & mask, key & mask, key >> 2 * bits)
+
+
+class Circuits:
+    """ Union-find over junction box indices """
+    __slots__ = ['parent', 'size', 'count']
+
+    def __init__(self, box_count: int):
+        self.parent = list(range(box_count))
+        self.size = [1] * box_count
+        self.count = box_count
+
+    def find(self, box: int) -> int:
+        parent = self.parent
+        root = box
+        while parent[root] != root:
+            root = parent[root]
+        while parent[box] != root:
+            parent[box], box = root, parent[box]
+        return root
+
+    def connect(self, box1: int, box2: int) -> bool:
+        """ Joins the circuits of both boxes, returns False if they were already connected """
+        r1, r2 = self.find(box1), self.find(box2)
+        if r1 == r2:
+            return False
+        if self.size[r1] < self.size[r2]:
+            r1, r2 = r2, r1
+        self.parent[r2] = r1
+        self.size[r1] += self.size[r2]
+        self.count -= 1
+        return True
+
+    def sizes(self) -> list[int]:
+        return [s for i, s in enumerate(self.size) if self.parent[i] == i]
 
 
 class Day8(Day):
     @staticmethod
-    def parse_input(input_str: str) -> list[Vector3D]:
-        junction_boxes: list[Vector3D] = []
-        for line in line_iterator(input_str):
-            x, y, z = (int(n) for n in line.split(','))
-            junction_boxes.append(Vector3D(x, y, z))
-        return junction_boxes
+    def parse_input(input_str: str) -> PointCloud3D:
+        return PointCloud3D.from_lines(list(line_iterator(input_str)))
 
     @staticmethod
-    def junction_box_pair_distances(junction_boxes: list[Vector3D]) -> Generator[JuncBoxPair]:
-        for jb1, jb2 in combinations(junction_boxes, 2):
-            yield JuncBoxPair(jb1, jb2, (jb1 - jb2).euclidean_dist_square)
-
-    def solve_part1(self, input_str: str) -> str:
-        junction_boxes = self.parse_input(input_str)
-
+    def solve_closest_connections(junction_boxes: PointCloud3D) -> int:
         # example has 20 junction boxes and requires 10 connections,
         # real input contains 1000 boxes and needs 1000 connections
         connections = 10 if len(junction_boxes) == 20 else 1000
 
-        # Find n closest junction box pairs
-        closest_distances = heapq.nsmallest(
-            n=connections,
-            iterable=self.junction_box_pair_distances(junction_boxes),
-            key=lambda p: p.distance_squared
-        )
-
-        # Create and connect junction boxes
-        circuits: dict[Vector3D, JuncBoxCircuit] = dict((b, JuncBoxCircuit(b)) for b in junction_boxes)
-        for jbp in closest_distances:
-            c1 = circuits[jbp.box1]
-            c2 = circuits[jbp.box2]
-            if c1 == c2:
-                continue
-            c3 = c1.connect_to(c2)
-            for b in c3.boxes:
-                circuits[b] = c3
+        circuits = Circuits(len(junction_boxes))
+        for jbp in junction_boxes.pairs_by_distance(connections):
+            circuits.connect(jbp.box1, jbp.box2)
 
         # Find largest circuits and calculate the result
-        sorted_circuits = sorted(set(circuits.values()), key=len, reverse=True)
-        result = reduce(lambda a, c: a * len(c), sorted_circuits[:3], 1)
+        return prod(heapq.nlargest(3, circuits.sizes()))
 
-        return str(result)
+    @staticmethod
+    def solve_last_connection(junction_boxes: PointCloud3D) -> int:
+        # Keep making connections until everything is in one circuit
+        circuits = Circuits(len(junction_boxes))
+        for connection in junction_boxes.pairs_by_distance():
+            if circuits.connect(connection.box1, connection.box2) and circuits.count == 1:
+                return junction_boxes.xs[connection.box1] * junction_boxes.xs[connection.box2]
+        raise RuntimeError('Something went wrong')
+
+    def solve_part1(self, input_str: str) -> str:
+        return str(self.solve_closest_connections(self.parse_input(input_str)))
 
     def solve_part2(self, input_str: str) -> str:
+        return str(self.solve_last_connection(self.parse_input(input_str)))
+
+    def parse_to_buffers(self, input_str: str) -> ParsedInput:
         junction_boxes = self.parse_input(input_str)
+        return {'xs': junction_boxes.xs, 'ys': junction_boxes.ys, 'zs': junction_boxes.zs}
+
+    def solve_part1_parsed(self, parsed: ParsedInput) -> str:
+        return str(self.solve_closest_connections(PointCloud3D(parsed['xs'], parsed['ys'], parsed['zs'])))
 
-        # Find all connections and sort them
-        all_possible_connections = sorted(
-            self.junction_box_pair_distances(junction_boxes),
-            key=lambda p: p.distance_squared
-        )
-
-        # Keep making connections
-        jbc = len(junction_boxes)
-        circuits: dict[Vector3D, JuncBoxCircuit] = dict((b, JuncBoxCircuit(b)) for b in junction_boxes)
-        last_connection: JuncBoxPair | None = None
-        for connection in all_possible_connections:
-            c1 = circuits[connection.box1]
-            c2 = circuits[connection.box2]
-            if c1 == c2:
-                continue
-            c3 = c1.connect_to(c2)
-            if len(c3) >= jbc:
-                last_connection = connection
-                break
-            for b in c3.boxes:
-                circuits[b] = c3
-        if last_connection is None:
-            raise RuntimeError('Something went wrong')
-
-        return str(last_connection.box1.x * last_connection.box2.x)
+    def solve_part2_parsed(self, parsed: ParsedInput) -> str:
+        return str(self.solve_last_connection(PointCloud3D(parsed['xs'], parsed['ys'], parsed['zs'])))
 
 
 if __name__ == '__main__':
@@ -2,7 +2,11 @@ from collections import deque
 from collections.abc import Iterator, Callable, Iterable
 from itertools import combinations, pairwise, chain
 
-from common import Day, line_iterator, Vector, Direction, LGrid, DIRECTION_TURN_CARDINAL, Grid, DIRECTIONS_CARDINAL
+from common import Day, line_iterator, Vector, Direction, LGrid, DIRECTION_TURN_CARDINAL, Grid, DIRECTIONS_CARDINAL, \
+    get_tracer
+
+
+tracer = get_tracer(9)
 
 
 class Day9(Day):
@@ -39,7 +43,8 @@ class Day9(Day):
     @staticmethod
     def walk_red_green_tiles(red_tiles: list[Vector], last_step=True) -> Iterator[tuple[Direction, Vector, bool]]:
         for c1, c2 in pairwise(chain(red_tiles, (red_tiles[0],))):
-            print(c1, c2)
+            if tracer:
+                tracer.debug('edge', c1, c2)
             if c1 == c2:
                 raise RuntimeError('Received 2 identical red tiles coordinates in a row')
             if c1.y == c2.y: